@@ -0,0 +1,195 @@
+"""In-process read-through cache for the API's GET routes.
+
+Entries are keyed by route and query, tagged with the collections they were
+built from, and expire after a TTL or when evicted as least recently used.
+Write handlers call ``invalidate`` with the collections they touched so only
+the affected entries are dropped. The cache also records when each collection
+was last written, which is what ``Last-Modified`` reports.
+"""
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    collections: Tuple[str, ...]
+    expires_at: float
+    # Last write to ``collections`` seen before the value was loaded
+    modified_at: Optional[datetime] = None
+    # Values derived from ``value`` (validators, rendered bodies), computed
+    # at most once per entry.
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+    def memo(self, name: str, compute: Callable[[Any], Any]) -> Any:
+        if name not in self.derived:
+            self.derived[name] = compute(self.value)
+        return self.derived[name]
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Bumped on every invalidation so a load that raced with a write
+        # is returned to its caller but never stored.
+        self._generations: Dict[str, int] = defaultdict(int)
+        # Wall-clock time of the last write per collection. Writes made before
+        # the cache existed (or cleared) are unknown, so they count as made then.
+        self._baseline = datetime.now(timezone.utc)
+        self._modified: Dict[str, datetime] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> "CacheEntry | None":
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def last_modified(self, collections: Iterable[str]) -> datetime:
+        """When any of ``collections`` was last written, as far as this process knows."""
+        return max((self._modified.get(name, self._baseline) for name in collections), default=self._baseline)
+
+    def set(
+        self, key: Hashable, value: Any, collections: Iterable[str], modified_at: Optional[datetime] = None
+    ) -> CacheEntry:
+        collections = tuple(collections)
+        entry = CacheEntry(
+            value=value,
+            collections=collections,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            modified_at=modified_at or self.last_modified(collections),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def lookup(self, key: Hashable) -> "CacheEntry | None":
+        """A fresh entry for ``key``, counted as a hit, without awaiting; None means it has to be loaded."""
+        if not self.enabled:
+            return None
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        collections: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        entry = await self.get_or_load_entry(key, collections, loader)
+        return entry.value
+
+    async def get_or_load_entry(
+        self,
+        key: Hashable,
+        collections: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> CacheEntry:
+        collections = tuple(collections)
+        if not self.enabled:
+            self.misses += 1
+            modified_at = self.last_modified(collections)
+            return CacheEntry(value=await loader(), collections=collections, expires_at=0.0, modified_at=modified_at)
+
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        # Single-flight: concurrent misses on the same key share one load.
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            generations = [self._generations[name] for name in collections]
+            modified_at = self.last_modified(collections)
+            value = await loader()
+            if generations == [self._generations[name] for name in collections]:
+                entry = self.set(key, value, collections, modified_at)
+            else:
+                entry = CacheEntry(value=value, collections=collections, expires_at=0.0, modified_at=modified_at)
+        self._locks.pop(key, None)
+        return entry
+
+    def invalidate(self, *collections: str) -> int:
+        """Drop every entry built from any of ``collections``."""
+        targets = set(collections)
+        now = datetime.now(timezone.utc)
+        for name in targets:
+            self._generations[name] += 1
+            self._modified[name] = now
+        stale = [key for key, entry in self._entries.items() if targets.intersection(entry.collections)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += 1
+        return len(stale)
+
+    def clear(self) -> None:
+        for name in list(self._generations):
+            self._generations[name] += 1
+        self._baseline = datetime.now(timezone.utc)
+        self._modified.clear()
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def cached(cache: ResponseCache, *collections: str):
+    """Decorate an async loader so its results are cached per argument tuple.
+
+    Awaiting the wrapper returns the cached value; ``wrapper.entry(*args)``
+    returns the whole ``CacheEntry`` for callers that need derived data, and
+    ``wrapper.cached_entry(*args)`` returns it only if it is already cached.
+    """
+    def decorator(loader):
+        def entry(*args):
+            return cache.get_or_load_entry((loader.__name__, *args), collections, lambda: loader(*args))
+
+        def cached_entry(*args):
+            return cache.lookup((loader.__name__, *args))
+
+        async def wrapper(*args):
+            return (await entry(*args)).value
+        wrapper.__name__ = loader.__name__
+        wrapper.__doc__ = loader.__doc__
+        wrapper.entry = entry
+        wrapper.cached_entry = cached_entry
+        wrapper.uncached = loader
+        return wrapper
+    return decorator
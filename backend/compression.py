@@ -0,0 +1,173 @@
+"""Negotiated gzip/brotli response compression.
+
+``CompressionMiddleware`` compresses complete (non-streaming) responses above
+a size threshold on the fly. Snapshot responses go through
+``compressed_variant`` instead: a strong ETag identifies the exact bytes,
+so each (ETag, encoding) pair is compressed once at a high level and reused
+for every later request. A strong ETag has to change with the
+content-coding, so compressed bodies are sent with the encoding appended
+(``"<hash>-br"``); validators compare tags with the suffix removed. Brotli is used when the ``brotli`` package is
+installed; gzip is always available.
+"""
+import gzip
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "500"))
+MAX_VARIANTS = int(os.environ.get("COMPRESSION_MAX_VARIANTS", "512"))
+# Levels for cached variants. Brotli 10-11 costs tens of milliseconds per
+# snapshot for no measurable gain on JSON this size, and it runs on the event loop.
+BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "9"))
+GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "9"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/", "image/svg+xml")
+
+# Server preference when the client accepts several encodings equally
+PREFERRED = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported content-coding from an Accept-Encoding header."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in PREFERRED:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding``-compressed variant of a response tagged ``etag``."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def decoded_etag(etag: str) -> str:
+    """``etag`` with any content-coding suffix added by ``encoded_etag`` removed."""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class VariantCache:
+    """LRU of compressed bodies keyed by (strong ETag, encoding)."""
+
+    def __init__(self, max_entries: int = MAX_VARIANTS):
+        self.max_entries = max_entries
+        self._variants: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, etag: str, encoding: str, body: bytes) -> bytes:
+        key = (etag, encoding)
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = compress(body, encoding)
+            self._variants[key] = variant
+            while len(self._variants) > self.max_entries:
+                self._variants.popitem(last=False)
+        else:
+            self._variants.move_to_end(key)
+        return variant
+
+
+variant_cache = VariantCache()
+
+
+def compressed_variant(accept_encoding: str, etag: str, body: bytes) -> Tuple[bytes, Optional[str]]:
+    """Body to send for a snapshot response and the content-coding applied, if any."""
+    if len(body) < MINIMUM_SIZE:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+    return variant_cache.get(etag, encoding, body), encoding
+
+
+class CompressionMiddleware:
+    """Compress buffered responses on the fly; streaming responses pass through untouched."""
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            # First body message: anything still streaming is sent as-is
+            passthrough = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress(body, encoding, self.levels[encoding])
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,148 @@
+"""HTTP validators (ETag / Last-Modified) and conditional GET handling."""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from cache import CacheEntry
+from compression import decoded_etag
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def content_etag(value: Any) -> str:
+    """Strong ETag: a hash of the canonical JSON form of ``value``."""
+    payload = json.dumps(jsonable_encoder(value), sort_keys=True, separators=(",", ":"))
+    return bytes_etag(payload.encode("utf-8"))
+
+
+def bytes_etag(body: bytes) -> str:
+    """Strong ETag for an already rendered response body."""
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def combine_etags(etags: Iterable[str]) -> str:
+    """Strong ETag for a response assembled from several cached parts."""
+    digest = hashlib.sha256("|".join(etags).encode("utf-8")).hexdigest()[:32]
+    return '"%s"' % digest
+
+
+def entry_etag(entry: CacheEntry) -> str:
+    return entry.memo("etag", content_etag)
+
+
+def entry_last_modified(entry: CacheEntry) -> Optional[datetime]:
+    """Last-Modified for ``entry``: the last write to its collections, not the
+    newest document timestamp, which stays put on deletes, reorders and
+    writes to documents without ``updatedAt``."""
+    return entry.modified_at
+
+
+def _as_utc(stamp: datetime) -> datetime:
+    # Mongo hands back naive UTC datetimes; HTTP dates have second precision.
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function; gzip/br variants share a validator.
+    candidates = [tag.strip() for tag in header.split(",")]
+    etag = decoded_etag(etag.removeprefix("W/"))
+    return any(decoded_etag(tag.removeprefix("W/")) == etag for tag in candidates)
+
+
+def revalidated_etag(request: Request, etag: str) -> str:
+    """ETag for a 304: the encoded variant the client presented, so caches keep the right tag on its body."""
+    for tag in request.headers.get("if-none-match", "").split(","):
+        tag = tag.strip().removeprefix("W/")
+        if decoded_etag(tag) == etag:
+            return tag
+    return etag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified) <= since
+    return False
+
+
+def precondition_failed(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """True when a write's If-Match / If-None-Match / If-Unmodified-Since rule it out.
+
+    ``etag`` is the current representation's ETag, or None when the target
+    does not exist yet.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is not None:
+        if etag is None:
+            return True
+        if if_match.strip() == "*":
+            return False
+        # If-Match uses the strong comparison function: weak tags never match.
+        return etag not in [decoded_etag(tag.strip()) for tag in if_match.split(",")]
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_unmodified_since = request.headers.get("if-unmodified-since")
+    if if_unmodified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_unmodified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified) > since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def conditional(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """Attach validators to ``response``; return a 304 if the client copy is current.
+
+    Route handlers use it as ``return conditional(...) or payload`` so the
+    payload is only serialized when the client actually needs it.
+    """
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers={**headers, "ETag": revalidated_etag(request, etag)})
+    response.headers.update(headers)
+    return None
+
+
+def conditional_entry(
+    request: Request,
+    response: Response,
+    entry: CacheEntry,
+) -> Optional[Response]:
+    return conditional(request, response, entry_etag(entry), entry_last_modified(entry))
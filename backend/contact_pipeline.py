@@ -0,0 +1,146 @@
+"""Throttling and write batching for the public contact form.
+
+``RateLimiter`` is a token bucket per key (client IP, sender email) whose
+state lives in a pluggable ``BucketStore``; the default keeps it in process
+memory. ``ContactWriteBuffer`` queues accepted messages and a background
+task flushes them with batched ``insert_many`` calls, so the request path
+never waits on MongoDB.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Optional[float]:
+        """Consume one token for ``key``; return None if allowed, else seconds until one is available."""
+
+
+class InMemoryBucketStore:
+    """Token buckets in a bounded LRU; idle buckets refill to full and can safely be evicted."""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Optional[float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        if allowed:
+            return None
+        return (1 - tokens) / refill_per_second if refill_per_second > 0 else float("inf")
+
+
+class RateLimiter:
+    def __init__(self, capacity: float, refill_per_second: float, store: Optional[BucketStore] = None):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.store = store or InMemoryBucketStore()
+        self.rejected = 0
+
+    async def check(self, *keys: str) -> Optional[float]:
+        """Take a token from every key's bucket; return the longest wait if any is empty."""
+        waits = [await self.store.take(key, self.capacity, self.refill_per_second) for key in keys if key]
+        waits = [wait for wait in waits if wait is not None]
+        if waits:
+            self.rejected += 1
+            return max(waits)
+        return None
+
+
+# Queued after the last message on shutdown; the flusher drains up to it and exits.
+_STOP = object()
+
+
+class ContactWriteBuffer:
+    def __init__(
+        self,
+        collection: Callable[[], object],
+        max_batch: int = 100,
+        flush_interval: float = 0.25,
+        max_queue: int = 10000,
+    ):
+        self._collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+        self.stats: Dict[str, int] = {"queued": 0, "written": 0, "batches": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._accepting and self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="contact-write-buffer")
+        self._accepting = True
+
+    def submit(self, document: dict) -> bool:
+        """Queue ``document`` for insertion; False means the caller must write it directly."""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(document)
+        except asyncio.QueueFull:
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    async def stop(self) -> None:
+        """Stop accepting messages and wait until everything queued is written."""
+        if self._task is None:
+            return
+        self._accepting = False
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]) -> None:
+        try:
+            await self._collection().insert_many(batch, ordered=False)
+            self.stats["written"] += len(batch)
+        except Exception:
+            # Keep the flusher alive; the failure is logged so lost messages are visible.
+            self.stats["failed"] += len(batch)
+            logger.exception("Failed to write %d contact messages", len(batch))
+        self.stats["batches"] += 1
@@ -0,0 +1,84 @@
+"""MongoDB client settings and connection health.
+
+Pool settings come from the environment. Unless ``MONGO_MAX_POOL_SIZE`` is
+set, each worker process gets an equal share of ``MONGO_POOL_BUDGET``
+connections, split across ``WEB_CONCURRENCY`` workers, so adding workers
+does not multiply the connections the server has to hold.
+``MONGO_MIN_POOL_SIZE`` connections are kept open, so the first requests
+after a cold start or an idle period skip the TCP/TLS handshake.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
+# Wire compressors and the package pymongo needs for each; zlib is built in
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def _int_env(name: str, default: Optional[int] = None) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+def worker_count() -> int:
+    return max(1, _int_env("WEB_CONCURRENCY", 1))
+
+
+def available_compressors(requested: str) -> List[str]:
+    """Requested compressors, in order, minus any whose package is not installed."""
+    compressors = []
+    for name in (part.strip().lower() for part in requested.split(",")):
+        if not name:
+            continue
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None:
+            logger.warning("Ignoring unknown MongoDB compressor %r", name)
+            continue
+        try:
+            __import__(module)
+        except ImportError:
+            logger.warning("Ignoring MongoDB compressor %r: %s is not installed", name, module)
+            continue
+        compressors.append(name)
+    return compressors
+
+
+def client_options() -> Dict[str, Any]:
+    """Keyword arguments for ``AsyncIOMotorClient`` built from the environment."""
+    max_pool = _int_env("MONGO_MAX_POOL_SIZE")
+    if max_pool is None:
+        max_pool = max(1, _int_env("MONGO_POOL_BUDGET", 100) // worker_count())
+    options: Dict[str, Any] = {
+        "maxPoolSize": max_pool,
+        "minPoolSize": min(_int_env("MONGO_MIN_POOL_SIZE", 2), max_pool),
+        "serverSelectionTimeoutMS": _int_env("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    }
+    max_idle = _int_env("MONGO_MAX_IDLE_TIME_MS")
+    if max_idle is not None:
+        options["maxIdleTimeMS"] = max_idle
+    compressors = available_compressors(os.environ.get("MONGO_COMPRESSORS", ""))
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
+def create_client(url: str, **kwargs: Any) -> "AsyncIOMotorClient":
+    """Motor client with the configured pool; no I/O happens until first use."""
+    # Imported here so importing the app does not load the driver until it connects
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(url, **{**client_options(), **kwargs})
+
+
+async def ping(db, timeout: float) -> float:
+    """Round-trip a ``ping`` to the server and return the latency in milliseconds."""
+    start = time.perf_counter()
+    await asyncio.wait_for(db.command("ping"), timeout)
+    return (time.perf_counter() - start) * 1000
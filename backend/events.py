@@ -0,0 +1,121 @@
+"""Server-sent events: one publisher, many subscribers.
+
+``EventBroker.publish`` is called for every write this worker applies,
+whether local or announced by another worker. It copies the event into
+each subscriber's bounded queue without waiting. A subscriber whose queue
+is full is dropped: its stream ends with a ``dropped`` event, and the
+browser's EventSource reconnects, at which point the client should
+refetch. A slow reader therefore never holds up publishing or other
+subscribers.
+"""
+import asyncio
+import itertools
+import json
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+# Queued in place of the backlog when a subscriber is dropped, and to every
+# subscriber on shutdown.
+_DROPPED = object()
+_CLOSED = object()
+
+
+class Subscription:
+    def __init__(self, max_queue: int, collections: Optional[Set[str]] = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.collections = collections
+
+    def wants(self, event: dict) -> bool:
+        return self.collections is None or event["collection"] in self.collections or event["collection"] == "*"
+
+    def _replace_backlog(self, marker: object) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(marker)
+
+
+class EventBroker:
+    def __init__(self, max_queue: int = 100, max_subscribers: int = 1000):
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self.stats: Dict[str, int] = {"published": 0, "delivered": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, collections: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(self.max_queue, set(collections) if collections else None)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: dict) -> None:
+        event = {**event, "id": next(self._ids)}
+        self.stats["published"] += 1
+        for subscription in list(self._subscribers):
+            if not subscription.wants(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                self.unsubscribe(subscription)
+                subscription._replace_backlog(_DROPPED)
+                self.stats["dropped"] += 1
+
+    def close(self) -> None:
+        """End every open stream."""
+        for subscription in list(self._subscribers):
+            self.unsubscribe(subscription)
+            subscription._replace_backlog(_CLOSED)
+
+
+def format_event(data: dict, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(
+    broker: EventBroker,
+    subscription: Subscription,
+    heartbeat: float,
+    max_duration: float,
+    retry_ms: int,
+) -> AsyncIterator[str]:
+    """Render ``subscription`` as an SSE body until it is dropped, closed or ``max_duration`` passes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                # Reconnecting spreads long-lived clients across workers again
+                yield format_event({"reason": "max-duration"}, event="reconnect")
+                return
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is _DROPPED:
+                yield format_event({"reason": "slow-consumer"}, event="dropped")
+                return
+            if item is _CLOSED:
+                return
+            data = {key: value for key, value in item.items() if key != "id"}
+            yield format_event(data, event=f"{item['collection']}.{item['op']}", event_id=item["id"])
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Export the public GET API as static files that a web server or CDN can
+serve without touching FastAPI or MongoDB.
+
+Each route is rendered with the same loaders and response models as the
+API, so the bytes match what the API would send. Each bundle is written
+twice:
+
+    api/projects.json                  stable name for clients that call the API path
+    api/projects.3f9c2a1b7d4e.json     content-hashed copy that never changes
+
+Both names also get precompressed .gz (and .br when brotli is installed)
+siblings. ``manifest.json`` maps every bundle to its hashed file. A run
+compares each collection's fingerprint with the previous manifest and
+rebuilds only the bundles whose collections changed. Files are written
+before the manifest, so readers never see a manifest that points at
+missing files.
+
+    python export_static.py --out ../build/static
+    python export_static.py --out ../build/static --html ../frontend/build/index.html
+"""
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import bson
+from pymongo.errors import OperationFailure
+
+import server
+from compression import PREFERRED, compress
+from conditional import bytes_etag, combine_etags
+from snapshots import render_json
+
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+EXTENSIONS = {"gzip": ".gz", "br": ".br"}
+HASHED_FILE = re.compile(r"^.+\.[0-9a-f]{%d}\.json(\.gz|\.br)?$" % HASH_LENGTH)
+
+# Bundle name -> (API path, collections it reads)
+BUNDLES = {
+    "profile": ("profile", ("profile",)),
+    "experience": ("experience", ("experience",)),
+    "projects": ("projects", ("projects",)),
+    "categories": ("projects/categories", ("projects",)),
+    "skills": ("skills", ("skills",)),
+    "certifications": ("certifications", ("certifications",)),
+    "achievements": ("achievements", ("achievements",)),
+    "portfolio": ("portfolio", tuple(server.PORTFOLIO_SECTIONS)),
+}
+
+
+async def fingerprint(collection):
+    """Hash of a collection's documents; ``dbHash`` computes it server-side."""
+    try:
+        result = await server.db.command("dbHash", collections=[collection])
+        return result["collections"].get(collection, "empty")
+    except (OperationFailure, NotImplementedError):
+        documents = await server.db[collection].find().sort("_id", 1).to_list(None)
+        return hashlib.md5(b"".join(bson.encode(document) for document in documents)).hexdigest()
+
+
+async def render_section(name):
+    """Body for one portfolio section, or None when the API would answer 404."""
+    value = await server.PORTFOLIO_SECTIONS[name].uncached()
+    if value is None:
+        return None
+    return render_json(value, server.PortfolioResponse.model_fields[name].annotation)
+
+
+async def render_categories():
+    categories = await server.fetch_project_categories.uncached()
+    return render_json({"categories": categories}, Dict[str, List[str]])
+
+
+def read_bundle(out_dir, entry):
+    return (out_dir / entry["file"]).read_bytes() if entry and entry.get("file") else None
+
+
+def splice_portfolio(sections):
+    # Same layout as GET /api/portfolio in snapshot mode; missing sections are null
+    return b"{" + b",".join(
+        b'"%s":%s' % (name.encode(), body if body is not None else b"null") for name, body in sections.items()
+    ) + b"}"
+
+
+def write_file(path, data):
+    """Replace ``path`` atomically so a server never reads a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+def write_variants(path, body):
+    write_file(path, body)
+    for encoding in PREFERRED:
+        write_file(path.with_name(path.name + EXTENSIONS[encoding]), compress(body, encoding))
+
+
+def remove_variants(path):
+    for candidate in [path] + [path.with_name(path.name + ext) for ext in EXTENSIONS.values()]:
+        if candidate.exists():
+            candidate.unlink()
+
+
+def write_bundle(out_dir, api_path, body, etag=None):
+    digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+    stable = out_dir / "api" / f"{api_path}.json"
+    hashed = stable.with_name(f"{stable.stem}.{digest}.json")
+    if not hashed.exists():
+        write_variants(hashed, body)
+    write_variants(stable, body)
+    return {
+        "file": hashed.relative_to(out_dir).as_posix(),
+        "path": f"/api/{api_path}",
+        "hash": digest,
+        "etag": etag or bytes_etag(body),
+        "bytes": len(body),
+    }
+
+
+def prune(out_dir, keep):
+    """Delete hashed files referenced by neither this manifest nor the previous one."""
+    removed = 0
+    for path in (out_dir / "api").rglob("*"):
+        if not HASHED_FILE.match(path.name):
+            continue
+        name = path.relative_to(out_dir).as_posix()
+        if name.removesuffix(".gz").removesuffix(".br") not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def render_html(template, portfolio, preload_url):
+    """Inject the portfolio into the frontend's index.html.
+
+    Crawlers and no-JS clients get the content straight away; React
+    replaces the pre-rendered markup in #root when it mounts.
+    """
+    data = json.loads(portfolio)
+    profile = data.get("profile") or {}
+    escape = html.escape
+    parts = []
+    if profile:
+        parts.append(f"<header><h1>{escape(profile['name'])}</h1><p>{escape(profile['title'])}</p>"
+                     f"<p>{escape(profile.get('bio', ''))}</p></header>")
+    if data.get("experience"):
+        items = "".join(f"<li>{escape(item['title'])}, {escape(item['company'])} ({escape(item['duration'])})</li>"
+                        for item in data["experience"])
+        parts.append(f"<section><h2>Experience</h2><ul>{items}</ul></section>")
+    if data.get("projects"):
+        items = "".join(f"<li><h3>{escape(item['title'])}</h3><p>{escape(item['description'])}</p></li>"
+                        for item in data["projects"])
+        parts.append(f"<section><h2>Projects</h2><ul>{items}</ul></section>")
+    if data.get("certifications"):
+        items = "".join(f"<li>{escape(item['name'])}, {escape(item['issuer'])}</li>" for item in data["certifications"])
+        parts.append(f"<section><h2>Certifications</h2><ul>{items}</ul></section>")
+
+    page = template
+    if profile:
+        title = escape(f"{profile['name']} | {profile['title']}")
+        page = re.sub(r"<title>.*?</title>", lambda _: f"<title>{title}</title>", page, count=1, flags=re.S)
+        page = re.sub(
+            r'<meta name="description" content="[^"]*"\s*/?>',
+            lambda _: f'<meta name="description" content="{escape(profile.get("bio", ""))}" />',
+            page, count=1,
+        )
+    preload = f'<link rel="preload" href="{escape(preload_url)}" as="fetch" crossorigin="anonymous" />'
+    page = page.replace("</head>", f"{preload}\n</head>", 1)
+    return page.replace('<div id="root"></div>', f'<div id="root">{"".join(parts)}</div>', 1)
+
+
+async def export_site(out_dir, html_template=None, base_url="", force=False):
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / "manifest.json"
+    previous = {}
+    if manifest_path.exists() and not force:
+        previous = json.loads(manifest_path.read_text())
+        if previous.get("version") != MANIFEST_VERSION:
+            previous = {}
+    old_bundles = previous.get("bundles", {})
+
+    collections = sorted({name for _, sources in BUNDLES.values() for name in sources})
+    prints = dict(zip(collections, await asyncio.gather(*(fingerprint(name) for name in collections))))
+
+    bundles, rebuilt = {}, []
+    for name, (api_path, sources) in BUNDLES.items():
+        old = old_bundles.get(name)
+        source_prints = {collection: prints[collection] for collection in sources}
+        if (old and old.get("sources") == source_prints
+                and (old.get("file") is None or (out_dir / old["file"]).exists())):
+            bundles[name] = old
+            continue
+
+        etag = None
+        if name == "portfolio":
+            sections = list(server.PORTFOLIO_SECTIONS)
+            body = splice_portfolio({section: read_bundle(out_dir, bundles[section]) for section in sections})
+            # Matches the ETag the API derives from the section snapshots
+            etag = combine_etags(
+                f"{section}:{bundles[section].get('etag') or bytes_etag(b'null')}" for section in sections
+            )
+        elif name == "categories":
+            body = await render_categories()
+        else:
+            body = await render_section(name)
+
+        if body is None:
+            # Nothing to serve; the API answers 404 here
+            remove_variants(out_dir / "api" / f"{api_path}.json")
+            bundles[name] = {"file": None, "path": f"/api/{api_path}", "sources": source_prints}
+        else:
+            bundles[name] = {**write_bundle(out_dir, api_path, body, etag), "sources": source_prints}
+        rebuilt.append(name)
+
+    html_info = previous.get("html")
+    if html_template:
+        template = Path(html_template).read_text()
+        template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+        portfolio = bundles["portfolio"]
+        if (html_info is None or "portfolio" in rebuilt or html_info.get("template") != template_hash
+                or html_info.get("baseUrl") != base_url or not (out_dir / "index.html").exists()):
+            page = render_html(template, read_bundle(out_dir, portfolio), f"{base_url.rstrip('/')}/{portfolio['file']}")
+            write_variants(out_dir / "index.html", page.encode("utf-8"))
+            rebuilt.append("index.html")
+        html_info = {"template": template_hash, "baseUrl": base_url, "file": "index.html"}
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generatedAt": datetime.utcnow().isoformat() + "Z",
+        "bundles": bundles,
+    }
+    if html_info:
+        manifest["html"] = html_info
+    write_file(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    keep = {entry["file"] for entry in list(bundles.values()) + list(old_bundles.values()) if entry.get("file")}
+    removed = prune(out_dir, keep)
+    return rebuilt, removed
+
+
+async def main(args):
+    try:
+        server.connect()
+        print(f"📦 Exporting static bundles to {args.out}{' (full rebuild)' if args.force else ''}...")
+        rebuilt, removed = await export_site(args.out, args.html, args.base_url, args.force)
+        if rebuilt:
+            for name in rebuilt:
+                print(f"   rebuilt {name}")
+        else:
+            print("   everything up to date")
+        if removed:
+            print(f"   removed {removed} stale files")
+        print("✅ Static export completed successfully!")
+    except Exception as e:
+        print(f"❌ Error exporting static site: {e}")
+        raise SystemExit(1)
+    finally:
+        if server.client is not None:
+            server.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the portfolio API as static JSON/HTML bundles")
+    parser.add_argument("--out", default=str(server.ROOT_DIR.parent / "build" / "static"),
+                        help="output directory (default ../build/static)")
+    parser.add_argument("--html", metavar="INDEX_HTML",
+                        help="frontend index.html to pre-render, e.g. ../frontend/build/index.html")
+    parser.add_argument("--base-url", default="",
+                        help="URL prefix for the bundles, such as a CDN origin (default: same origin)")
+    parser.add_argument("--force", action="store_true", help="ignore the previous manifest and rebuild everything")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Contact inbox maintenance: filters, archival and retention.
+
+The hot ``contact_messages`` collection holds only recent messages. Older
+ones are moved in batches to ``contact_messages_archive``: each batch is
+copied first and then deleted from the inbox. A run interrupted between
+the two steps leaves copies in both collections, and the next run finishes
+the move, because duplicate inserts are ignored. That makes archival safe
+to run concurrently from several workers. An optional TTL index expires
+archived messages after ``CONTACT_ARCHIVE_TTL_DAYS``.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "contact_messages_archive"
+ARCHIVE_BATCH_SIZE = 500
+TTL_INDEX_NAME = "archivedAt_ttl"
+
+ARCHIVE_AFTER_DAYS = float(os.environ.get("CONTACT_ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_TTL_DAYS = float(os.environ.get("CONTACT_ARCHIVE_TTL_DAYS", "0"))
+ARCHIVE_INTERVAL_SECONDS = float(os.environ.get("CONTACT_ARCHIVE_INTERVAL_MINUTES", "60")) * 60
+
+DUPLICATE_KEY = 11000
+
+
+def message_filter(
+    ids: Optional[List[str]] = None,
+    is_read: Optional[bool] = None,
+    email: Optional[str] = None,
+    before: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """MongoDB filter for the inbox; invalid ids simply match nothing."""
+    query: Dict[str, Any] = {}
+    if ids is not None:
+        query["_id"] = {"$in": [ObjectId(value) for value in ids if ObjectId.is_valid(value)]}
+    if is_read is not None:
+        query["isRead"] = is_read
+    if email:
+        query["email"] = email
+    if before is not None:
+        query["createdAt"] = {"$lt": before}
+    return query
+
+
+async def archive_messages(
+    db,
+    query: Dict[str, Any],
+    now: Callable[[], datetime],
+    changes: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Move every inbox message matching ``query`` to the archive, applying
+    ``changes`` to the archived copies; return how many moved."""
+    moved = 0
+    while True:
+        batch = await db.contact_messages.find(query).limit(ARCHIVE_BATCH_SIZE).to_list(None)
+        if not batch:
+            return moved
+        archived_at = now()
+        try:
+            await db[ARCHIVE_COLLECTION].insert_many(
+                [{**message, **(changes or {}), "archivedAt": archived_at} for message in batch], ordered=False
+            )
+        except BulkWriteError as exc:
+            # Copies left behind by an interrupted run are fine; anything else is not
+            if any(error.get("code") != DUPLICATE_KEY for error in exc.details.get("writeErrors", [])):
+                raise
+        result = await db.contact_messages.delete_many({"_id": {"$in": [message["_id"] for message in batch]}})
+        moved += result.deleted_count
+        if len(batch) < ARCHIVE_BATCH_SIZE:
+            return moved
+
+
+async def ensure_archive_ttl(db, ttl_days: float = ARCHIVE_TTL_DAYS) -> None:
+    """Create, retune or drop the TTL index on archived messages to match ``ttl_days``."""
+    collection = db[ARCHIVE_COLLECTION]
+    existing = (await collection.index_information()).get(TTL_INDEX_NAME)
+    if ttl_days <= 0:
+        if existing:
+            await collection.drop_index(TTL_INDEX_NAME)
+        return
+    seconds = int(ttl_days * 86400)
+    if existing is None:
+        await collection.create_index([("archivedAt", ASCENDING)], name=TTL_INDEX_NAME, expireAfterSeconds=seconds)
+    elif existing.get("expireAfterSeconds") != seconds:
+        await db.command("collMod", ARCHIVE_COLLECTION, index={"name": TTL_INDEX_NAME, "expireAfterSeconds": seconds})
+
+
+async def run_retention(db, now: Callable[[], datetime], interval: float = ARCHIVE_INTERVAL_SECONDS) -> None:
+    """Archive messages older than ``CONTACT_ARCHIVE_AFTER_DAYS`` every ``interval`` seconds."""
+    while True:
+        try:
+            moved = await archive_messages(db, message_filter(before=now() - timedelta(days=ARCHIVE_AFTER_DAYS)), now)
+            if moved:
+                logger.info("Archived %d contact messages older than %g days", moved, ARCHIVE_AFTER_DAYS)
+        except Exception:
+            logger.exception("Contact archival failed; retrying next interval")
+        await asyncio.sleep(interval)
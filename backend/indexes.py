@@ -0,0 +1,105 @@
+"""Index definitions for every sort/filter key the API queries on.
+
+``ensure_indexes`` runs at startup and is idempotent: ``create_indexes`` is a
+no-op for indexes that already exist with the same spec. ``log_query_plans``
+is a diagnostic aid that explains each query shape and warns about
+collection scans and in-memory sorts.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "experience": [
+        IndexModel([("order", ASCENDING)], name="order_asc"),
+    ],
+    "projects": [
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="createdAt_id_desc"),
+        IndexModel([("category", ASCENDING)], name="category_asc"),
+    ],
+    "certifications": [
+        IndexModel([("year", DESCENDING)], name="year_desc"),
+    ],
+    "achievements": [
+        IndexModel([("order", ASCENDING)], name="order_asc"),
+    ],
+    "contact_messages": [
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="createdAt_id_desc"),
+        IndexModel([("isRead", ASCENDING), ("createdAt", DESCENDING)], name="isRead_createdAt"),
+    ],
+    "contact_messages_archive": [
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="createdAt_id_desc"),
+    ],
+}
+
+# (collection, command) pairs mirroring the queries issued by server.py
+QUERY_SHAPES = [
+    ("experience", {"find": "experience", "filter": {}, "sort": {"order": 1}}),
+    ("projects", {"find": "projects", "filter": {}, "sort": {"createdAt": -1, "_id": -1}}),
+    ("projects", {"distinct": "projects", "key": "category", "query": {}}),
+    ("certifications", {"find": "certifications", "filter": {}, "sort": {"year": -1}}),
+    ("achievements", {"find": "achievements", "filter": {}, "sort": {"order": 1}}),
+    ("contact_messages", {"find": "contact_messages", "filter": {}, "sort": {"createdAt": -1, "_id": -1}}),
+    ("contact_messages", {"find": "contact_messages", "filter": {"isRead": False}, "sort": {"createdAt": -1}}),
+    ("contact_messages", {"count": "contact_messages", "query": {"isRead": False}}),
+    ("contact_messages", {"find": "contact_messages", "filter": {"createdAt": {"$lt": datetime(2000, 1, 1)}}, "limit": 500}),
+    ("contact_messages_archive", {"find": "contact_messages_archive", "filter": {}, "sort": {"createdAt": -1, "_id": -1}}),
+]
+
+# Stages that mean the query is not fully served by an index
+COSTLY_STAGES = {"COLLSCAN", "SORT"}
+
+
+def explain_enabled() -> bool:
+    return os.environ.get("MONGO_EXPLAIN", "").lower() in ("1", "true", "yes")
+
+
+async def ensure_indexes(db) -> None:
+    for collection, models in INDEXES.items():
+        try:
+            names = await db[collection].create_indexes(models)
+            logger.info("Ensured indexes on %s: %s", collection, ", ".join(names))
+        except OperationFailure as exc:
+            # An index with the same keys but different options already exists;
+            # leave it alone rather than failing startup.
+            logger.warning("Could not ensure indexes on %s: %s", collection, exc)
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    plan = plan.get("queryPlan", plan)
+    stages = [plan["stage"]] if "stage" in plan else []
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def log_query_plans(db, slow_ms: Optional[int] = None) -> None:
+    """Explain every known query shape and log how it is executed."""
+    if slow_ms is None:
+        slow_ms = int(os.environ.get("MONGO_SLOW_QUERY_MS", "50"))
+    for collection, command in QUERY_SHAPES:
+        explain = await db.command({"explain": command, "verbosity": "executionStats"})
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        stats = explain.get("executionStats", {})
+        elapsed = stats.get("executionTimeMillis", 0)
+        summary = "%s %s: plan=%s docsExamined=%s keysExamined=%s %sms" % (
+            collection,
+            next(iter(command)),
+            " <- ".join(stages) or "unknown",
+            stats.get("totalDocsExamined"),
+            stats.get("totalKeysExamined"),
+            elapsed,
+        )
+        if COSTLY_STAGES.intersection(stages) or elapsed >= slow_ms:
+            logger.warning("Slow query plan %s", summary)
+        else:
+            logger.info("Query plan %s", summary)
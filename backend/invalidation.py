@@ -0,0 +1,257 @@
+"""Cross-process write notifications for multi-worker deployments.
+
+Each worker keeps its own response cache and search index, so a write
+handled by one worker has to reach the others. Two transports are
+supported, chosen with ``INVALIDATION_BUS``:
+
+``capped``
+    Writes are appended to a small capped collection, and every worker
+    tails it with a tailable cursor. This works on a standalone mongod.
+``changestream``
+    Every worker watches the content collections through a change stream.
+    This needs a replica set, but it also catches writes made outside the
+    API (seed script, shell).
+
+Events are ``{"collection", "ids", "op"}`` dicts; ``ids`` of None means
+"anything in the collection may have changed". Applying an event is
+idempotent, so a redelivered event is harmless. If a worker may have
+missed events (a dropped connection, or a capped collection that wrapped
+past its position), ``on_reset`` is called so it can drop all local state.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Set
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+logger = logging.getLogger(__name__)
+
+BUS_MODES = ("off", "capped", "changestream")
+CAPPED_COLLECTION = "write_events"
+CAPPED_SIZE_BYTES = 1024 * 1024
+# Events naming more documents than this carry ids=None instead
+MAX_EVENT_IDS = 100
+RETRY_SECONDS = 1.0
+MAX_RETRY_SECONDS = 30.0
+STOP_TIMEOUT_SECONDS = 5.0
+
+Event = Dict[str, Any]
+EventHandler = Callable[[Event], Awaitable[None]]
+ResetHandler = Callable[[], Awaitable[None]]
+
+
+def make_event(collection: str, ids: Optional[Iterable[Any]] = None, op: str = "upsert") -> Event:
+    ids = None if ids is None else [str(value) for value in ids]
+    if ids is not None and len(ids) > MAX_EVENT_IDS:
+        ids = None
+    return {"collection": collection, "ids": ids, "op": op}
+
+
+class InvalidationBus(Protocol):
+    # True when this worker's own writes come back through the bus
+    echoes_local_writes: bool
+
+    def publish(self, event: Event) -> None:
+        """Announce a local write to the other workers; must not block."""
+
+    async def start(self) -> None:
+        ...
+
+    async def stop(self) -> None:
+        ...
+
+
+class NullBus:
+    """Single-process mode: nothing to tell anyone."""
+
+    echoes_local_writes = False
+
+    def publish(self, event: Event) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class CappedCollectionBus:
+    echoes_local_writes = False
+
+    def __init__(
+        self,
+        db: Callable[[], Any],
+        origin: str,
+        on_event: EventHandler,
+        on_reset: ResetHandler,
+        size_bytes: int = CAPPED_SIZE_BYTES,
+    ):
+        self._db = db
+        self.origin = origin
+        self._on_event = on_event
+        self._on_reset = on_reset
+        self.size_bytes = size_bytes
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.stats: Dict[str, int] = {"published": 0, "received": 0, "resets": 0}
+
+    def _collection(self):
+        return self._db()[CAPPED_COLLECTION]
+
+    async def _ensure_collection(self) -> None:
+        try:
+            await self._db().create_collection(CAPPED_COLLECTION, capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass
+        # A tailable cursor on an empty capped collection dies immediately
+        if await self._collection().find_one() is None:
+            await self._collection().insert_one({"origin": self.origin, "event": None, "at": datetime.now(timezone.utc)})
+
+    async def start(self) -> None:
+        self._outbox = asyncio.Queue()
+        started_at = datetime.now(timezone.utc)
+        self._tasks = [
+            asyncio.create_task(self._publisher(), name="write-events-publisher"),
+            asyncio.create_task(self._tail(started_at), name="write-events-tail"),
+        ]
+
+    async def stop(self) -> None:
+        if self._outbox is not None:
+            # Let queued events go out before the client closes
+            try:
+                await asyncio.wait_for(self._outbox.join(), STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Dropped %d unpublished write events on shutdown", self._outbox.qsize())
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def publish(self, event: Event) -> None:
+        if self._outbox is not None:
+            self._outbox.put_nowait(event)
+
+    async def _publisher(self) -> None:
+        while True:
+            events = [await self._outbox.get()]
+            while not self._outbox.empty():
+                events.append(self._outbox.get_nowait())
+            now = datetime.now(timezone.utc)
+            try:
+                await self._collection().insert_many(
+                    [{"origin": self.origin, "event": event, "at": now} for event in events]
+                )
+                self.stats["published"] += len(events)
+            except Exception:
+                # Other workers keep serving until their TTL expires; make that visible
+                logger.exception("Failed to publish %d write events", len(events))
+            finally:
+                for _ in events:
+                    self._outbox.task_done()
+
+    async def _tail(self, since: datetime) -> None:
+        # Reopened cursors resume at the last timestamp seen; these are the
+        # events already applied at exactly that timestamp.
+        seen_at_since: Set[Any] = set()
+        delay = RETRY_SECONDS
+        while True:
+            try:
+                await self._ensure_collection()
+                cursor = self._collection().find({"at": {"$gte": since}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for document in cursor:
+                        if document["_id"] in seen_at_since:
+                            continue
+                        if document["at"] != since:
+                            since, seen_at_since = document["at"], set()
+                        seen_at_since.add(document["_id"])
+                        if document.get("origin") == self.origin or not document.get("event"):
+                            continue
+                        self.stats["received"] += 1
+                        await self._on_event(document["event"])
+                    await asyncio.sleep(0)
+                delay = RETRY_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Write event tail failed; resetting local caches and retrying in %.0fs", delay)
+                self.stats["resets"] += 1
+                await self._on_reset()
+                delay = min(delay * 2, MAX_RETRY_SECONDS)
+            await asyncio.sleep(delay)
+
+
+class ChangeStreamBus:
+    echoes_local_writes = True
+
+    def __init__(self, db: Callable[[], Any], collections: Iterable[str], on_event: EventHandler, on_reset: ResetHandler):
+        self._db = db
+        self.collections = list(collections)
+        self._on_event = on_event
+        self._on_reset = on_reset
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"published": 0, "received": 0, "resets": 0}
+
+    def publish(self, event: Event) -> None:
+        # The change stream reports the write itself
+        pass
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._watch(), name="change-stream")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": self.collections}}}]
+        resume_token = None
+        delay = RETRY_SECONDS
+        while True:
+            try:
+                async with self._db().watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        ids = [change["documentKey"]["_id"]] if "documentKey" in change else None
+                        op = "delete" if change["operationType"] == "delete" else "upsert"
+                        self.stats["received"] += 1
+                        await self._on_event(make_event(change["ns"]["coll"], ids, op))
+                        delay = RETRY_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change stream failed; resetting local caches and retrying in %.0fs", delay)
+                self.stats["resets"] += 1
+                resume_token = None
+                await self._on_reset()
+                delay = min(delay * 2, MAX_RETRY_SECONDS)
+            await asyncio.sleep(delay)
+
+
+def create_bus(
+    mode: str,
+    db: Callable[[], Any],
+    origin: str,
+    collections: Iterable[str],
+    on_event: EventHandler,
+    on_reset: ResetHandler,
+) -> InvalidationBus:
+    if mode == "capped":
+        return CappedCollectionBus(db, origin, on_event, on_reset)
+    if mode == "changestream":
+        return ChangeStreamBus(db, collections, on_event, on_reset)
+    if mode != "off":
+        raise ValueError(f"INVALIDATION_BUS must be one of {', '.join(BUS_MODES)}, not {mode!r}")
+    return NullBus()
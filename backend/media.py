@@ -0,0 +1,264 @@
+"""Uploaded images: content-addressed storage and responsive WebP variants.
+
+An upload is keyed by the SHA-256 of its bytes. The original and its
+resized WebP variants are stored under that key, either on local disk
+(``MEDIA_STORAGE=local``) or in an S3-compatible bucket
+(``MEDIA_STORAGE=s3``, which needs boto3). Stored files never change, so
+they can be cached forever, and uploading the same image twice reuses the
+first copy. Decoding and resizing are CPU-bound, so they run in a process
+pool instead of on the event loop. Metadata lives in the ``media``
+collection, and it is written only after every file is in place.
+"""
+import asyncio
+import hashlib
+import importlib.util
+import io
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+from starlette.staticfiles import StaticFiles
+
+MEDIA_COLLECTION = "media"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Upload formats accepted: Pillow format -> (extension, content type) of the stored original
+FORMATS = {"JPEG": ("jpg", "image/jpeg"), "PNG": ("png", "image/png"), "WEBP": ("webp", "image/webp"), "GIF": ("gif", "image/gif")}
+
+MEDIA_STORAGE = os.environ.get("MEDIA_STORAGE", "local").lower()
+MEDIA_ROOT = Path(os.environ.get("MEDIA_ROOT", Path(__file__).parent / "media"))
+# Where the API serves MEDIA_ROOT in local mode
+MEDIA_PATH = "/api/media/files"
+MEDIA_BASE_URL = os.environ.get("MEDIA_BASE_URL", MEDIA_PATH).rstrip("/")
+MEDIA_WIDTHS = tuple(sorted(int(width) for width in os.environ.get("MEDIA_WIDTHS", "320,640,960,1280").split(",")))
+MEDIA_WEBP_QUALITY = int(os.environ.get("MEDIA_WEBP_QUALITY", "80"))
+MEDIA_MAX_BYTES = int(os.environ.get("MEDIA_MAX_BYTES", str(10 * 1024 * 1024)))
+MEDIA_MAX_PIXELS = int(os.environ.get("MEDIA_MAX_PIXELS", "40000000"))
+MEDIA_WORKERS = int(os.environ.get("MEDIA_WORKERS", "2"))
+
+
+class InvalidImage(ValueError):
+    """The upload is not an image this pipeline can read."""
+
+
+class MediaUnavailable(RuntimeError):
+    """Image processing or the configured storage is not available."""
+
+
+def render_variants(data: bytes, widths: List[int], quality: int, max_pixels: int) -> Dict[str, Any]:
+    """Decode an image and encode a WebP at each width below its own.
+
+    Runs in a worker process. The largest variant is the full image capped
+    at the widest configured width; images are never upscaled.
+    """
+    # Only the worker processes need Pillow loaded
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with Image.open(io.BytesIO(data)) as probe:
+            image_format = probe.format
+            probe.verify()
+        image = Image.open(io.BytesIO(data))
+        # Phone photos are often stored sideways with an EXIF rotation flag
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except UnidentifiedImageError:
+        raise InvalidImage("Not a recognised image file") from None
+    except (Image.DecompressionBombError, OSError, SyntaxError) as exc:
+        raise InvalidImage(f"Unreadable image: {exc}") from None
+    if image_format not in FORMATS:
+        raise InvalidImage(f"Unsupported image format: {image_format}")
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    width, height = image.size
+    variants = []
+    for target in sorted({w for w in widths if w < width} | {min(width, widths[-1])}):
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        buffer = io.BytesIO()
+        resized.save(buffer, "WEBP", quality=quality, method=4)
+        variants.append({"width": resized.width, "height": resized.height, "data": buffer.getvalue()})
+    return {"format": image_format, "width": width, "height": height, "variants": variants}
+
+
+class MediaStorage(Protocol):
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        ...
+
+    def url(self, key: str) -> str:
+        ...
+
+
+class LocalStorage:
+    def __init__(self, root: Path, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Identical uploads racing each other write the same bytes; each uses its own temporary file
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(self._write, key, data)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage:
+    """Any S3-compatible store (AWS, MinIO, R2); boto3 calls run in threads."""
+
+    def __init__(self, bucket: str, base_url: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.base_url = base_url or f"{(endpoint_url or 'https://s3.amazonaws.com').rstrip('/')}/{bucket}"
+        self._client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(
+            self._client.put_object,
+            Bucket=self.bucket, Key=self.prefix + key, Body=data, ContentType=content_type, CacheControl=IMMUTABLE,
+        )
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{self.prefix}{key}"
+
+
+def create_storage() -> MediaStorage:
+    if MEDIA_STORAGE == "s3":
+        bucket = os.environ.get("MEDIA_S3_BUCKET")
+        if not bucket:
+            raise ValueError("MEDIA_STORAGE=s3 needs MEDIA_S3_BUCKET")
+        # Without MEDIA_BASE_URL set explicitly, files are linked on the bucket itself
+        return S3Storage(
+            bucket,
+            os.environ.get("MEDIA_BASE_URL", "").rstrip("/"),
+            prefix=os.environ.get("MEDIA_S3_PREFIX", "media/"),
+            endpoint_url=os.environ.get("MEDIA_S3_ENDPOINT_URL") or None,
+        )
+    if MEDIA_STORAGE != "local":
+        raise ValueError(f"MEDIA_STORAGE must be 'local' or 's3', not {MEDIA_STORAGE!r}")
+    return LocalStorage(MEDIA_ROOT, MEDIA_BASE_URL)
+
+
+class MediaPipeline:
+    def __init__(
+        self,
+        storage_factory: Callable[[], MediaStorage],
+        widths: tuple = MEDIA_WIDTHS,
+        quality: int = MEDIA_WEBP_QUALITY,
+        max_pixels: int = MEDIA_MAX_PIXELS,
+        workers: int = MEDIA_WORKERS,
+    ):
+        self.storage_factory = storage_factory
+        self._storage: Optional[MediaStorage] = None
+        self.widths = list(widths)
+        self.quality = quality
+        self.max_pixels = max_pixels
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def storage(self) -> MediaStorage:
+        # Created on first upload, so S3 credentials and boto3 are only needed once images are used
+        if self._storage is None:
+            try:
+                self._storage = self.storage_factory()
+            except (ImportError, ValueError) as exc:
+                raise MediaUnavailable(f"Media storage is not configured: {exc}") from None
+        return self._storage
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first upload; spawn rather than fork, since the parent
+        # runs an event loop and driver threads
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def store(self, db, data: bytes, now) -> Dict[str, Any]:
+        """Store an uploaded image and its variants; return its ``media`` document."""
+        if importlib.util.find_spec("PIL") is None:
+            raise MediaUnavailable("Image uploads need Pillow installed")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = await db[MEDIA_COLLECTION].find_one({"_id": digest})
+        if existing:
+            return existing
+
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            rendered = await loop.run_in_executor(pool, render_variants, data, self.widths, self.quality, self.max_pixels)
+        except BrokenProcessPool:
+            # A worker died (out of memory, codec crash); the next upload starts a fresh pool
+            if self._pool is pool:
+                self.close()
+            raise MediaUnavailable("Image processing failed; try the upload again") from None
+        prefix = f"{digest[:2]}/{digest}"
+        extension, content_type = FORMATS[rendered["format"]]
+        original_key = f"{prefix}/original.{extension}"
+        variant_keys = [f"{prefix}/w{variant['width']}.webp" for variant in rendered["variants"]]
+        await asyncio.gather(
+            self.storage.put(original_key, data, content_type),
+            *(self.storage.put(key, variant["data"], "image/webp")
+              for key, variant in zip(variant_keys, rendered["variants"])),
+        )
+        document = {
+            "_id": digest,
+            "url": self.storage.url(original_key),
+            "contentType": content_type,
+            "bytes": len(data),
+            "width": rendered["width"],
+            "height": rendered["height"],
+            "variants": [
+                {"url": self.storage.url(key), "width": variant["width"], "height": variant["height"],
+                 "bytes": len(variant["data"])}
+                for key, variant in zip(variant_keys, rendered["variants"])
+            ],
+            "createdAt": now(),
+        }
+        # Concurrent uploads of the same image write identical files; the first document wins
+        await db[MEDIA_COLLECTION].update_one({"_id": digest}, {"$setOnInsert": document}, upsert=True)
+        return document
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def image_attributes(media: Dict[str, Any]) -> Dict[str, Any]:
+    """``<img>`` attributes for a stored image: the largest variant as ``src`` plus a width-based ``srcset``."""
+    variants = media["variants"]
+    largest = variants[-1]
+    return {
+        "mediaId": media["_id"],
+        "src": largest["url"],
+        "srcset": ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants),
+        "width": largest["width"],
+        "height": largest["height"],
+        "original": media["url"],
+    }
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Serves ``MEDIA_ROOT``; every path is content-addressed, so responses are cacheable forever."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
@@ -0,0 +1,93 @@
+"""Keyset pagination on ``(createdAt, _id)`` and NDJSON streaming of Motor cursors."""
+import base64
+import binascii
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple, Type
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Newest first; _id breaks ties between documents created in the same millisecond.
+PAGE_SORT = [("createdAt", -1), ("_id", -1)]
+
+
+def encode_cursor(document: dict) -> str:
+    raw = f"{document['createdAt'].isoformat()}|{document['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, _, object_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+    except (binascii.Error, UnicodeError, ValueError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(after: Optional[str]) -> dict:
+    """Query matching every document that sorts after the ``after`` cursor."""
+    if not after:
+        return {}
+    created_at, object_id = decode_cursor(after)
+    return {
+        "$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": object_id}},
+        ]
+    }
+
+
+async def fetch_page(
+    collection,
+    limit: int,
+    after: Optional[str] = None,
+    projection: Optional[dict] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Return up to ``limit`` documents after ``after`` and the cursor for the next page."""
+    if projection is not None:
+        # The cursor is built from createdAt, so it is always fetched
+        projection = {**projection, "createdAt": 1}
+    documents = await (
+        collection.find(keyset_filter(after), projection).sort(PAGE_SORT).limit(limit + 1).to_list(limit + 1)
+    )
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    documents = documents[:limit]
+    for document in documents:
+        document["_id"] = str(document["_id"])
+    return documents, next_cursor
+
+
+def wants_ndjson(request: Request, format: Optional[str]) -> bool:
+    if format:
+        return format == "ndjson"
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_rows(cursor, model: Type[BaseModel]) -> AsyncIterator[str]:
+    async for document in cursor:
+        document["_id"] = str(document["_id"])
+        yield model.model_validate(document).model_dump_json(by_alias=True) + "\n"
+
+
+def ndjson_response(
+    collection,
+    model: Type[BaseModel],
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[dict] = None,
+) -> StreamingResponse:
+    """Stream matching documents one JSON line at a time straight off the Motor cursor."""
+    cursor = collection.find(keyset_filter(after), projection).sort(PAGE_SORT).batch_size(STREAM_BATCH_SIZE)
+    if limit:
+        cursor = cursor.limit(limit)
+    return StreamingResponse(_ndjson_rows(cursor, model), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,219 @@
+"""In-memory inverted index over projects, experience and certifications.
+
+Documents are tokenized per field with field weights. Queries AND their
+terms together, the last term also matching as a prefix for
+search-as-you-type, and hits are ranked by weighted term frequency times
+IDF. Facet counts for each filter are computed over the matches with every
+other filter applied. The index is built once from MongoDB and then kept
+current by the write handlers via ``upsert``/``remove``.
+"""
+import bisect
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Field weights per searchable collection
+FIELD_WEIGHTS = {
+    "projects": {"title": 3.0, "technologies": 2.0, "category": 2.0, "description": 1.0, "status": 0.5},
+    "experience": {"title": 3.0, "company": 2.0, "type": 1.0, "location": 0.5, "responsibilities": 1.0},
+    "certifications": {"name": 3.0, "issuer": 2.0, "credential": 1.0, "year": 0.5},
+}
+
+# Facet name -> document field, per collection
+FACET_FIELDS = {
+    "projects": {"category": "category", "tech": "technologies", "status": "status"},
+    "experience": {"category": "type"},
+    "certifications": {},
+}
+FACETS = ("type", "category", "tech", "status")
+
+# Fields returned with each hit, so clients can render results without a second fetch
+HIT_FIELDS = {
+    "projects": ("category", "status", "technologies", "githubUrl", "liveUrl"),
+    "experience": ("company", "duration", "type", "location"),
+    "certifications": ("issuer", "year", "verificationUrl"),
+}
+TITLE_FIELD = {"projects": "title", "experience": "title", "certifications": "name"}
+
+DocKey = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _values(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item is not None]
+    return [str(value)]
+
+
+@dataclass
+class IndexedDocument:
+    type: str
+    id: str
+    title: str
+    fields: Dict[str, Any]
+    facets: Dict[str, Set[str]]
+    terms: Dict[str, float] = field(default_factory=dict)
+
+
+class SearchIndex:
+    def __init__(self):
+        self._documents: Dict[DocKey, IndexedDocument] = {}
+        self._postings: Dict[str, Dict[DocKey, float]] = defaultdict(dict)
+        self._vocabulary: List[str] = []
+        self.ready = False
+        # Bumped on every change to a collection, so a build can tell that a
+        # write landed while it was reading from MongoDB
+        self.generations: Dict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def touch(self, *collections: str) -> None:
+        """Record a change that has not been applied to the index."""
+        for collection in collections:
+            self.generations[collection] += 1
+
+    def rebuild(self, collection: str, documents: Iterable[dict]) -> None:
+        for key in [key for key in self._documents if key[0] == collection]:
+            self.remove(*key)
+        for document in documents:
+            self.upsert(collection, document)
+
+    def upsert(self, collection: str, document: dict) -> None:
+        doc_id = str(document["_id"])
+        self.remove(collection, doc_id)
+        self.generations[collection] += 1
+
+        terms: Counter = Counter()
+        for name, weight in FIELD_WEIGHTS[collection].items():
+            for value in _values(document.get(name)):
+                for token in tokenize(value):
+                    terms[token] += weight
+
+        facets = {"type": {collection}}
+        for facet, name in FACET_FIELDS[collection].items():
+            facets[facet] = set(_values(document.get(name)))
+
+        indexed = IndexedDocument(
+            type=collection,
+            id=doc_id,
+            title=str(document.get(TITLE_FIELD[collection], "")),
+            fields={name: document.get(name) for name in HIT_FIELDS[collection]},
+            facets=facets,
+            terms=dict(terms),
+        )
+        key = (collection, doc_id)
+        self._documents[key] = indexed
+        for token, weight in terms.items():
+            postings = self._postings[token]
+            if not postings:
+                bisect.insort(self._vocabulary, token)
+            postings[key] = weight
+
+    def remove(self, collection: str, doc_id: str) -> None:
+        self.generations[collection] += 1
+        key = (collection, str(doc_id))
+        indexed = self._documents.pop(key, None)
+        if indexed is None:
+            return
+        for token in indexed.terms:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                position = bisect.bisect_left(self._vocabulary, token)
+                if position < len(self._vocabulary) and self._vocabulary[position] == token:
+                    del self._vocabulary[position]
+
+    def _expand(self, token: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [token] if token in self._postings else []
+        start = bisect.bisect_left(self._vocabulary, token)
+        matches = []
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(token):
+                break
+            matches.append(candidate)
+        return matches
+
+    def _match(self, query: str) -> Optional[Dict[DocKey, float]]:
+        """Score every document containing all query terms; None means no query was given."""
+        tokens = tokenize(query or "")
+        if not tokens:
+            return None
+        total = len(self._documents) or 1
+        scores: Optional[Dict[DocKey, float]] = None
+        for position, token in enumerate(tokens):
+            term_scores: Dict[DocKey, float] = defaultdict(float)
+            for term in self._expand(token, prefix=position == len(tokens) - 1):
+                postings = self._postings[term]
+                idf = math.log(1 + total / len(postings))
+                for key, weight in postings.items():
+                    term_scores[key] = max(term_scores[key], weight * idf)
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def search(
+        self,
+        query: str = "",
+        filters: Optional[Dict[str, List[str]]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        filters = {name: {value.lower() for value in values} for name, values in (filters or {}).items() if values}
+        scores = self._match(query)
+        candidates = list(self._documents) if scores is None else list(scores)
+
+        def passes(key: DocKey, skip: Optional[str] = None) -> bool:
+            facets = self._documents[key].facets
+            for name, wanted in filters.items():
+                if name == skip:
+                    continue
+                if not wanted.intersection(value.lower() for value in facets.get(name, ())):
+                    return False
+            return True
+
+        matched = [key for key in candidates if passes(key)]
+
+        # Each facet is counted with all other filters applied, so clients can
+        # show how many results selecting another value would give.
+        facet_counts: Dict[str, Dict[str, int]] = {}
+        for name in FACETS:
+            counts: Counter = Counter()
+            pool = matched if name not in filters else [key for key in candidates if passes(key, skip=name)]
+            for key in pool:
+                counts.update(self._documents[key].facets.get(name, ()))
+            facet_counts[name] = dict(counts.most_common())
+
+        if scores is not None:
+            matched.sort(key=lambda key: (-scores[key], self._documents[key].title))
+        else:
+            matched.sort(key=lambda key: (key[0], self._documents[key].title))
+
+        hits = []
+        for key in matched[offset:offset + limit]:
+            indexed = self._documents[key]
+            hits.append({
+                "id": indexed.id,
+                "type": indexed.type,
+                "title": indexed.title,
+                "score": round(scores[key], 4) if scores is not None else 0.0,
+                "fields": indexed.fields,
+            })
+        return {"total": len(matched), "hits": hits, "facets": facet_counts}
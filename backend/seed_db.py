@@ -1,6 +1,10 @@
+import argparse
 import asyncio
+import hashlib
+import json
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteOne, UpdateOne
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
@@ -221,64 +225,97 @@ MOCK_DATA = {
     ]
 }
 
-async def seed_database():
-    """Seed the database with mock data"""
+# Natural key for each seeded collection; an empty key marks a singleton
+# document. contact_messages is deliberately absent: real inbox data is
+# never touched by the seeder.
+SEED_KEYS = {
+    "profile": (),
+    "experience": ("title", "company"),
+    "projects": ("title",),
+    "skills": (),
+    "certifications": ("name", "issuer"),
+    "achievements": ("description",),
+}
+
+TIMESTAMP_FIELDS = ("createdAt", "updatedAt")
+
+def content_hash(entry):
+    """Stable hash of a mock entry, ignoring its timestamps"""
+    content = {key: value for key, value in entry.items() if key not in TIMESTAMP_FIELDS}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def plan_collection(entries, existing, key_fields, now, prune=False):
+    """Build the writes needed to bring one collection in line with the mock data.
+
+    Returns the pymongo operations plus a summary of what changed.
+    """
+    current = {tuple(doc.get(field) for field in key_fields): doc for doc in existing}
+    operations = []
+    summary = {"inserted": [], "updated": [], "unchanged": [], "deleted": []}
+    seen = set()
+
+    for entry in entries:
+        key = tuple(entry[field] for field in key_fields)
+        seen.add(key)
+        digest = content_hash(entry)
+        doc = current.get(key)
+        label = " / ".join(map(str, key)) or "document"
+        if doc is not None and doc.get("seedHash") == digest:
+            summary["unchanged"].append(label)
+            continue
+
+        content = {k: v for k, v in entry.items() if k not in TIMESTAMP_FIELDS}
+        operations.append(UpdateOne(
+            {"_id": doc["_id"]} if doc is not None else dict(zip(key_fields, key)),
+            {"$set": {**content, "seedHash": digest, "updatedAt": now}, "$setOnInsert": {"createdAt": now}},
+            upsert=True
+        ))
+        summary["updated" if doc is not None else "inserted"].append(label)
+
+    if prune:
+        # Only documents the seeder created are pruned; anything added
+        # through the API has no seedHash and is left alone.
+        for key, doc in current.items():
+            if key not in seen and "seedHash" in doc:
+                operations.append(DeleteOne({"_id": doc["_id"]}))
+                summary["deleted"].append(" / ".join(map(str, key)) or "document")
+
+    return operations, summary
+
+async def seed_database(dry_run=False, prune=False):
+    """Seed the database with mock data, writing only what changed"""
     try:
-        print("🌱 Starting database seeding...")
-        
-        # Clear existing data
-        print("🧹 Clearing existing collections...")
-        await db.profile.delete_many({})
-        await db.experience.delete_many({})
-        await db.projects.delete_many({})
-        await db.skills.delete_many({})
-        await db.certifications.delete_many({})
-        await db.achievements.delete_many({})
-        await db.contact_messages.delete_many({})
-        
-        # Insert profile data
-        print("👤 Inserting profile data...")
-        await db.profile.insert_one(MOCK_DATA["profile"])
-        
-        # Insert experience data
-        print("💼 Inserting experience data...")
-        await db.experience.insert_many(MOCK_DATA["experience"])
-        
-        # Insert projects data
-        print("🚀 Inserting projects data...")
-        await db.projects.insert_many(MOCK_DATA["projects"])
-        
-        # Insert skills data
-        print("🛠️ Inserting skills data...")
-        await db.skills.insert_one(MOCK_DATA["skills"])
-        
-        # Insert certifications data
-        print("🏆 Inserting certifications data...")
-        await db.certifications.insert_many(MOCK_DATA["certifications"])
-        
-        # Insert achievements data
-        print("⭐ Inserting achievements data...")
-        await db.achievements.insert_many(MOCK_DATA["achievements"])
-        
+        print(f"🌱 Starting database seeding{' (dry run)' if dry_run else ''}...")
+        now = datetime.utcnow()
+        totals = {}
+
+        for collection, key_fields in SEED_KEYS.items():
+            entries = MOCK_DATA[collection]
+            singleton = isinstance(entries, dict)
+            if singleton:
+                entries = [entries]
+            projection = {**{field: 1 for field in key_fields}, "seedHash": 1}
+            existing = await db[collection].find({}, projection).to_list(1 if singleton else None)
+
+            operations, summary = plan_collection(entries, existing, key_fields, now, prune=prune)
+            totals[collection] = summary
+            for action in ("inserted", "updated", "deleted"):
+                for label in summary[action]:
+                    print(f"   {collection}: {action} {label}")
+
+            if operations and not dry_run:
+                await db[collection].bulk_write(operations, ordered=False)
+
         print("✅ Database seeding completed successfully!")
-        
+
         # Print summary
-        profile_count = await db.profile.count_documents({})
-        experience_count = await db.experience.count_documents({})
-        projects_count = await db.projects.count_documents({})
-        skills_count = await db.skills.count_documents({})
-        certifications_count = await db.certifications.count_documents({})
-        achievements_count = await db.achievements.count_documents({})
-        
-        print(f"""
-📊 Database Summary:
-   Profile: {profile_count} record
-   Experience: {experience_count} records
-   Projects: {projects_count} records
-   Skills: {skills_count} record
-   Certifications: {certifications_count} records
-   Achievements: {achievements_count} records
-        """)
+        print("\n📊 Seeding Summary:")
+        for collection, summary in totals.items():
+            counts = ", ".join(f"{len(labels)} {action}" for action, labels in summary.items())
+            print(f"   {collection.capitalize()}: {counts}")
+        if dry_run:
+            print("   (dry run: no changes written)")
         
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
@@ -286,4 +323,8 @@ async def seed_database():
         client.close()
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the portfolio database with mock data")
+    parser.add_argument("--dry-run", action="store_true", help="show what would change without writing")
+    parser.add_argument("--prune", action="store_true", help="delete seeded documents no longer in the mock data")
+    args = parser.parse_args()
+    asyncio.run(seed_database(dry_run=args.dry_run, prune=args.prune))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Serve the API with uvicorn across one or more worker processes.
+
+With more than one worker, writes are announced through the invalidation
+bus (see invalidation.py) so that every worker drops its stale cache
+entries. The Mongo connection pool budget is split across the workers.
+
+    python serve.py --workers 4 --port 8001
+    python serve.py --workers 4 --bus changestream   # replica set only
+    python serve.py --forwarded-allow-ips 10.0.0.5    # behind an ingress
+"""
+import argparse
+import os
+from pathlib import Path
+
+import uvicorn
+
+from invalidation import BUS_MODES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the portfolio API")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8001")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        help="worker processes (default WEB_CONCURRENCY or 1)",
+    )
+    parser.add_argument(
+        "--bus", choices=BUS_MODES, default=os.environ.get("INVALIDATION_BUS"),
+        help="cross-worker invalidation transport (default: capped with several workers, else off)",
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips", default=os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        help="proxy IPs whose X-Forwarded-For is trusted for the client IP, comma-separated or * "
+             "(default FORWARDED_ALLOW_IPS or 127.0.0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    workers = max(1, args.workers)
+    bus = args.bus or ("capped" if workers > 1 else "off")
+    if workers > 1 and bus == "off":
+        print("⚠️  Running several workers without an invalidation bus; caches go stale until CACHE_TTL_SECONDS")
+
+    # Read by every worker when it imports server.py
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    os.environ["INVALIDATION_BUS"] = bus
+
+    print(f"🚀 Serving on {args.host}:{args.port} with {workers} worker(s), invalidation bus: {bus}")
+    uvicorn.run(
+        "server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        app_dir=str(Path(__file__).parent),
+        # The contact form rate limit keys on the client IP, which behind a
+        # proxy is only right when the proxy's X-Forwarded-For is trusted
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        # Open /api/events streams would otherwise hold shutdown until they expire
+        timeout_graceful_shutdown=int(os.environ.get("GRACEFUL_SHUTDOWN_SECONDS", "10")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,115 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Body, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, ValidationError, create_model
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+import asyncio
+import math
 import uuid
 from datetime import datetime
 
+from cache import ResponseCache, cached
+from compression import CompressionMiddleware
+from database import client_options, create_client, ping, worker_count
+from invalidation import create_bus, make_event
+from events import EventBroker, event_stream
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, MongoCommandListener, registry as metrics_registry
+from contact_pipeline import ContactWriteBuffer, RateLimiter
+from media import (
+    MEDIA_MAX_BYTES, MEDIA_PATH, MEDIA_ROOT, MEDIA_STORAGE, ImmutableStaticFiles, InvalidImage, MediaPipeline,
+    MediaUnavailable, create_storage, image_attributes,
+)
+from inbox import ARCHIVE_AFTER_DAYS, ARCHIVE_COLLECTION, archive_messages, ensure_archive_ttl, message_filter, run_retention
+from search import FIELD_WEIGHTS, SearchIndex
+from indexes import ensure_indexes, explain_enabled, log_query_plans
+from conditional import bytes_etag, combine_etags, conditional, entry_etag, entry_last_modified, precondition_failed
+from snapshots import (
+    SNAPSHOTS_ENABLED, cached_response, document_etag, entry_snapshot, render_json, rendered_response, snapshot_response,
+)
+from pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PAGE_SORT, decode_cursor, fetch_page, ndjson_response, wants_ndjson,
+)
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# MongoDB connection, opened by connect() when the app starts rather than at
+# import, so tools and tests can import this module without a database
+client = None
+db = None
+PING_TIMEOUT = float(os.environ.get('MONGO_PING_TIMEOUT_MS', '2000')) / 1000
+
+# Set once startup warm-up (indexes, cache priming, search index) has finished
+warmup_done = asyncio.Event()
+
+# Read-through cache for GET routes; write handlers invalidate by collection
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', '256')),
+    ttl_seconds=float(os.environ.get('CACHE_TTL_SECONDS', '300')),
+)
+
+# Inverted index behind /api/search, kept current by the write handlers
+search_index = SearchIndex()
+search_index_lock = asyncio.Lock()
+
+# Public contact form: token-bucket throttling per client IP and sender email,
+# with accepted messages written in batches by a background task
+contact_limiter = RateLimiter(
+    capacity=float(os.environ.get('CONTACT_RATE_BURST', '5')),
+    refill_per_second=float(os.environ.get('CONTACT_RATE_PER_HOUR', '20')) / 3600,
+)
+contact_buffer = ContactWriteBuffer(
+    lambda: db.contact_messages,
+    max_batch=int(os.environ.get('CONTACT_FLUSH_BATCH', '100')),
+    flush_interval=float(os.environ.get('CONTACT_FLUSH_INTERVAL_MS', '250')) / 1000,
+)
+
+# Server-sent events for /api/events, fed by local and remote writes
+event_broker = EventBroker(
+    max_queue=int(os.environ.get('SSE_QUEUE_SIZE', '100')),
+    max_subscribers=int(os.environ.get('SSE_MAX_CLIENTS', '1000')),
+)
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_MAX_SECONDS = float(os.environ.get('SSE_MAX_SECONDS', '300'))
+
+# Uploaded images, stored content-addressed with resized WebP variants;
+# the storage backend is created on the first upload
+media_pipeline = MediaPipeline(create_storage)
+
+# Collections behind the public GET routes; their writes are broadcast
+CONTENT_COLLECTIONS = ("profile", "experience", "projects", "skills", "certifications", "achievements")
 
-# Create the main app without a prefix
-app = FastAPI()
+def connect():
+    """Create the Motor client from MONGO_URL / DB_NAME unless a database is already set."""
+    global client, db
+    if db is None:
+        client = create_client(os.environ['MONGO_URL'], event_listeners=[MongoCommandListener()])
+        db = client[os.environ['DB_NAME']]
+    return db
+
+def set_database(database, database_client=None):
+    """Use ``database`` instead of connecting from the environment (tests, scripts)."""
+    global client, db
+    client, db = database_client, database
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+def utcnow():
+    # BSON dates have millisecond precision; truncating here keeps responses
+    # built from the written document identical to what a later read returns.
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
 # Models
 class PersonalProfile(BaseModel):
     name: str
@@ -65,8 +151,33 @@ class Project(BaseModel):
     liveUrl: Optional[str] = None
     imageUrl: Optional[str] = None
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    bytes: int
+
+class MediaResponse(BaseModel):
+    id: str = Field(alias="_id")
+    url: str
+    contentType: str
+    bytes: int
+    width: int
+    height: int
+    variants: List[ImageVariant]
+    createdAt: datetime
+
+class ProjectImage(BaseModel):
+    mediaId: str
+    src: str
+    srcset: str
+    width: int
+    height: int
+    original: str
+
 class ProjectResponse(Project):
     id: str = Field(alias="_id")
+    image: Optional[ProjectImage] = None
     createdAt: datetime
     updatedAt: datetime
 
@@ -82,6 +193,16 @@ class SkillsResponse(Skills):
     id: str = Field(alias="_id")
     updatedAt: datetime
 
+class SoftSkill(BaseModel):
+    name: str
+
+class SkillStats(BaseModel):
+    count: int
+    averageLevel: Optional[float] = None
+    minLevel: Optional[int] = None
+    maxLevel: Optional[int] = None
+    top: List[TechnicalSkill]
+
 class Certification(BaseModel):
     name: str
     issuer: str
@@ -112,174 +233,1163 @@ class ContactMessageResponse(ContactMessage):
     id: str = Field(alias="_id")
     isRead: bool
     createdAt: datetime
+    archivedAt: Optional[datetime] = None
+
+class ContactMessageUpdate(BaseModel):
+    isRead: Optional[bool] = None
+    archived: Optional[bool] = None
+
+class ContactMessageFilter(BaseModel):
+    ids: Optional[List[str]] = None
+    isRead: Optional[bool] = None
+    email: Optional[str] = None
+    before: Optional[datetime] = None
+    # Required to match the whole inbox, so a missing filter cannot
+    all: bool = False
+
+class ContactBulkUpdate(ContactMessageUpdate):
+    filter: ContactMessageFilter
+
+class ContactBulkUpdateResponse(BaseModel):
+    matched: int
+    modified: int
+    archived: int
+
+class UnreadCountResponse(BaseModel):
+    unread: int
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[str] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+class BulkWriteResponse(BaseModel):
+    inserted: int
+    failed: int
+    results: List[BulkItemResult]
+
+class ReorderRequest(BaseModel):
+    ids: List[str]
+
+class ReorderResponse(BaseModel):
+    modified: int
+
+class PortfolioResponse(BaseModel):
+    profile: Optional[PersonalProfileResponse] = None
+    experience: Optional[List[ExperienceResponse]] = None
+    projects: Optional[List[ProjectResponse]] = None
+    skills: Optional[SkillsResponse] = None
+    certifications: Optional[List[CertificationResponse]] = None
+    achievements: Optional[List[AchievementResponse]] = None
+
+# Sparse fieldsets: ?fields=title,category on list endpoints
+def parse_fields(fields: Optional[str], model) -> Optional[Tuple[str, ...]]:
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    allowed = set(model.model_fields) - {"id"}
+    unknown = names - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(sorted(allowed))}"
+        )
+    return tuple(sorted(names))
+
+def field_projection(fields: Optional[Tuple[str, ...]]) -> Optional[dict]:
+    return {name: 1 for name in fields} if fields else None
+
+@lru_cache(maxsize=128)
+def sparse_model(model, fields: Tuple[str, ...]):
+    """``model`` trimmed to ``fields`` plus the id."""
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name == "id" or name in fields
+    }
+    return create_model(f"{model.__name__}Fields", **definitions)
+
+class SearchHit(BaseModel):
+    id: str
+    type: str
+    title: str
+    score: float
+    fields: Dict[str, Any]
+
+class SearchResponse(BaseModel):
+    total: int
+    hits: List[SearchHit]
+    facets: Dict[str, Dict[str, int]]
+
+def notify_write(collection, *documents):
+    """Apply the side effects of a write (cache invalidation, search index
+    updates) and announce it to the other workers and event subscribers."""
+    response_cache.invalidate(collection)
+    if collection in FIELD_WEIGHTS:
+        for document in documents:
+            search_index.upsert(collection, document)
+    announce(make_event(collection, (document["_id"] for document in documents)))
+
+def notify_delete(collection, *ids):
+    """``notify_write`` for documents that no longer exist."""
+    response_cache.invalidate(collection)
+    if collection in FIELD_WEIGHTS:
+        for doc_id in ids:
+            search_index.remove(collection, doc_id)
+    announce(make_event(collection, ids, "delete"))
+
+def announce(event):
+    invalidation_bus.publish(event)
+    if not invalidation_bus.echoes_local_writes:
+        event_broker.publish(event)
+
+# Conditional writes: If-Match / If-None-Match / If-Unmodified-Since are
+# checked against the stored document, which is then updated only if it
+# still has the version that was checked.
+PRECONDITION_HEADERS = ("if-match", "if-none-match", "if-unmodified-since")
+PRECONDITION_FAILED = "Precondition failed: the resource was changed by another request"
+
+def has_preconditions(request):
+    return any(name in request.headers for name in PRECONDITION_HEADERS)
+
+def check_preconditions(request, collection, current, response_model):
+    """Raise 412 unless the request's preconditions hold for ``current`` (None if absent).
+
+    If-Unmodified-Since is compared with the collection's last write, the
+    same time the GET routes send as Last-Modified.
+    """
+    etag = last_modified = None
+    if current is not None:
+        etag = document_etag({**current, "_id": str(current["_id"])}, response_model)
+        last_modified = response_cache.last_modified((collection,))
+    if precondition_failed(request, etag, last_modified):
+        raise HTTPException(status_code=412, detail=PRECONDITION_FAILED)
+
+def version_query(current, fields):
+    """Match ``current`` only while it is unchanged: by ``updatedAt`` when it
+    has one, otherwise by the values of ``fields``."""
+    if "updatedAt" in current:
+        return {"_id": current["_id"], "updatedAt": current["updatedAt"]}
+    return {"_id": current["_id"], **{field: current.get(field) for field in fields}}
+
+async def conditional_write(
+    request, response, collection, query, changes, response_model, timestamps, missing=None, computed=None
+):
+    """Set ``changes`` on the document matching ``query`` and return it.
+
+    A missing document is created, or reported as ``missing`` (404) when
+    given. Writes that would not change anything skip the update, the cache
+    invalidation and the notifications. Only requests with preconditions
+    read the document before writing. ``timestamps`` lists the
+    fields stamped with the write time (``createdAt`` only on insert).
+    ``computed`` maps further fields to aggregation expressions over the
+    stored document; they are set in the same write. The response carries
+    the new ETag for the next conditional write.
+    """
+    now = utcnow()
+    stamps = {"updatedAt": now} if "updatedAt" in timestamps else {}
+    if computed:
+        # A pipeline update, so the expressions can read the stored values
+        literals = {field: {"$literal": value} for field, value in changes.items()}
+        update = [{"$set": {**literals, **stamps, **computed}}]
+    else:
+        update = {"$set": {**changes, **stamps}}
+    conditional = has_preconditions(request)
+    document, written = None, True
+    if not conditional and changes:
+        # Usually a single round trip: the update only matches when a field
+        # differs. Without preconditions the last writer wins.
+        differs = {"$or": [{field: {"$ne": value}} for field, value in changes.items()]}
+        document = await db[collection].find_one_and_update(
+            {**query, **differs}, update, return_document=ReturnDocument.AFTER
+        )
+
+    if document is None:
+        # Preconditions to check, or nothing matched: unchanged or missing
+        current = await db[collection].find_one(query)
+        if current is None and missing:
+            raise HTTPException(status_code=404, detail=missing)
+        if conditional:
+            check_preconditions(request, collection, current, response_model)
+
+        if current is not None and all(current.get(field) == value for field, value in changes.items()):
+            # Nothing would change: no write, no invalidation
+            document, written = current, False
+        elif current is None:
+            if "createdAt" in timestamps and computed:
+                update[0]["$set"]["createdAt"] = now
+            elif "createdAt" in timestamps:
+                update["$setOnInsert"] = {"createdAt": now}
+            document = await db[collection].find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        else:
+            guard = version_query(current, changes) if conditional else {"_id": current["_id"]}
+            document = await db[collection].find_one_and_update(guard, update, return_document=ReturnDocument.AFTER)
+            if document is None:
+                # Changed or deleted since it was read
+                if conditional:
+                    raise HTTPException(status_code=412, detail=PRECONDITION_FAILED)
+                raise HTTPException(status_code=404, detail=missing or "Not found")
+
+    document["_id"] = str(document["_id"])
+    if written:
+        notify_write(collection, document)
+    response.headers["ETag"] = document_etag(document, response_model)
+    return document
+
+async def apply_remote_write(event):
+    """Apply a write announced by another worker, then tell event subscribers."""
+    try:
+        await refresh_from_event(event)
+    finally:
+        event_broker.publish(event)
+
+async def refresh_from_event(event):
+    collection = event["collection"]
+    response_cache.invalidate(collection)
+    if collection not in FIELD_WEIGHTS:
+        return
+    if not search_index.ready:
+        # A build in progress re-reads the collection
+        search_index.touch(collection)
+        return
+    if event["ids"] is None:
+        search_index.rebuild(collection, await db[collection].find().to_list(None))
+        return
+    if event["op"] == "delete":
+        for doc_id in event["ids"]:
+            search_index.remove(collection, doc_id)
+        return
+    object_ids = [ObjectId(doc_id) if ObjectId.is_valid(doc_id) else doc_id for doc_id in event["ids"]]
+    documents = await db[collection].find({"_id": {"$in": object_ids}}).to_list(None)
+    for document in documents:
+        search_index.upsert(collection, document)
+    for doc_id in set(event["ids"]) - {str(document["_id"]) for document in documents}:
+        search_index.remove(collection, doc_id)
+
+async def reset_local_state():
+    """Forget everything derived from MongoDB after possibly missing remote writes."""
+    response_cache.clear()
+    search_index.ready = False
+    search_index.touch(*FIELD_WEIGHTS)
+    event_broker.publish(make_event("*", None, "reset"))
+
+# Writes reach the other worker processes through MongoDB, so each can drop
+# its stale cache entries; single-process deployments need no bus.
+INVALIDATION_BUS = os.environ.get('INVALIDATION_BUS', 'capped' if worker_count() > 1 else 'off').lower()
+WORKER_ID = uuid.uuid4().hex
+invalidation_bus = create_bus(
+    INVALIDATION_BUS,
+    lambda: db,
+    WORKER_ID,
+    CONTENT_COLLECTIONS,
+    apply_remote_write,
+    reset_local_state,
+)
+
+async def ensure_search_index():
+    if search_index.ready:
+        return
+    async with search_index_lock:
+        if search_index.ready:
+            return
+        # A collection written to while it was being read is read again;
+        # rebuilding from the older read would erase that write
+        pending = list(FIELD_WEIGHTS)
+        while pending:
+            generations = [search_index.generations[name] for name in pending]
+            results = await asyncio.gather(*(db[name].find().to_list(None) for name in pending))
+            changed = [name for name, generation in zip(pending, generations) if search_index.generations[name] != generation]
+            for name, documents in zip(pending, results):
+                if name not in changed:
+                    search_index.rebuild(name, documents)
+            pending = changed
+        search_index.ready = True
+        logger.info("Search index built with %d documents", len(search_index))
+
+# Section loaders, shared by the individual GET routes and /api/portfolio
+@cached(response_cache, "profile")
+async def fetch_profile():
+    profile = await db.profile.find_one()
+    if profile:
+        profile["_id"] = str(profile["_id"])
+    return profile
+
+@cached(response_cache, "experience")
+async def fetch_experience():
+    experiences = await db.experience.find().sort("order", 1).to_list(100)
+    for exp in experiences:
+        exp["_id"] = str(exp["_id"])
+    return experiences
+
+@cached(response_cache, "projects")
+async def fetch_projects():
+    projects = await db.projects.find().sort(PAGE_SORT).to_list(None)
+    for project in projects:
+        project["_id"] = str(project["_id"])
+    return projects
+
+@cached(response_cache, "projects")
+async def fetch_projects_page(limit, after, fields=None):
+    projects, next_cursor = await fetch_page(db.projects, limit, after, field_projection(fields))
+    return {"items": projects, "next_cursor": next_cursor}
+
+@cached(response_cache, "projects")
+async def fetch_projects_fields(fields):
+    projects = await db.projects.find({}, field_projection(fields)).sort(PAGE_SORT).to_list(None)
+    for project in projects:
+        project["_id"] = str(project["_id"])
+    return projects
+
+@cached(response_cache, "experience")
+async def fetch_experience_fields(fields):
+    experiences = await db.experience.find({}, field_projection(fields)).sort("order", 1).to_list(100)
+    for exp in experiences:
+        exp["_id"] = str(exp["_id"])
+    return experiences
+
+@cached(response_cache, "skills")
+async def fetch_skills():
+    skills = await db.skills.find_one()
+    if skills:
+        skills["_id"] = str(skills["_id"])
+    return skills
+
+@cached(response_cache, "certifications")
+async def fetch_certifications():
+    certifications = await db.certifications.find().sort("year", -1).to_list(100)
+    for cert in certifications:
+        cert["_id"] = str(cert["_id"])
+    return certifications
+
+@cached(response_cache, "achievements")
+async def fetch_achievements():
+    achievements = await db.achievements.find().sort("order", 1).to_list(100)
+    for achievement in achievements:
+        achievement["_id"] = str(achievement["_id"])
+    return achievements
+
+@cached(response_cache, "skills")
+async def fetch_skill_stats(top):
+    pipeline = [
+        {"$unwind": "$technical"},
+        {"$sort": {"technical.level": -1, "technical.name": 1}},
+        {"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "averageLevel": {"$avg": "$technical.level"},
+            "minLevel": {"$min": "$technical.level"},
+            "maxLevel": {"$max": "$technical.level"},
+            "skills": {"$push": "$technical"},
+        }},
+        {"$project": {"_id": 0, "count": 1, "averageLevel": 1, "minLevel": 1, "maxLevel": 1, "top": {"$slice": ["$skills", top]}}},
+    ]
+    results = await db.skills.aggregate(pipeline).to_list(1)
+    if not results or not results[0]["count"]:
+        return {"count": 0, "top": []}
+    stats = results[0]
+    stats["averageLevel"] = round(stats["averageLevel"], 1)
+    return stats
+
+@cached(response_cache, "projects")
+async def fetch_project_categories():
+    return await db.projects.distinct("category")
+
+PORTFOLIO_SECTIONS = {
+    "profile": fetch_profile,
+    "experience": fetch_experience,
+    "projects": fetch_projects,
+    "skills": fetch_skills,
+    "certifications": fetch_certifications,
+    "achievements": fetch_achievements,
+}
 
 # API Routes
 
+# Portfolio endpoint: every section in one round trip
+@api_router.get("/portfolio", response_model=PortfolioResponse)
+async def get_portfolio(request: Request, sections: Optional[str] = None):
+    if sections:
+        names = [name.strip() for name in sections.split(",") if name.strip()]
+        unknown = [name for name in names if name not in PORTFOLIO_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown sections: {', '.join(unknown)}. "
+                       f"Valid sections: {', '.join(PORTFOLIO_SECTIONS)}"
+            )
+    else:
+        names = list(PORTFOLIO_SECTIONS)
+    names = list(dict.fromkeys(names))
+
+    # Cached sections are taken without awaiting; the ones that missed load concurrently
+    entries = [PORTFOLIO_SECTIONS[name].cached_entry() for name in names]
+    missing = [index for index, entry in enumerate(entries) if entry is None]
+    if missing:
+        loaded = await asyncio.gather(*(PORTFOLIO_SECTIONS[names[index]].entry() for index in missing))
+        for index, entry in zip(missing, loaded):
+            entries[index] = entry
+    last_modified = max(map(entry_last_modified, entries))
+
+    if SNAPSHOTS_ENABLED:
+        # Splice the per-section snapshots together instead of re-encoding them
+        snapshots = [
+            entry_snapshot(entry, PortfolioResponse.model_fields[name].annotation)
+            for name, entry in zip(names, entries)
+        ]
+        etag = combine_etags(f"{name}:{etag}" for name, (_, etag) in zip(names, snapshots))
+        body = b"{" + b",".join(b'"%s":%s' % (name.encode(), body) for name, (body, _) in zip(names, snapshots)) + b"}"
+        return snapshot_response(request, body, etag, last_modified)
+
+    etag = combine_etags(f"{name}:{entry_etag(entry)}" for name, entry in zip(names, entries))
+    values = {name: entry.value for name, entry in zip(names, entries)}
+    return snapshot_response(
+        request,
+        lambda: PortfolioResponse.model_validate(values).model_dump_json(by_alias=True, include=set(names)).encode(),
+        etag,
+        last_modified,
+    )
+
 # Profile endpoints
 @api_router.get("/profile", response_model=PersonalProfileResponse)
-async def get_profile():
-    profile = await db.profile.find_one()
-    if not profile:
+async def get_profile(request: Request, response: Response):
+    entry = await fetch_profile.entry()
+    if not entry.value:
         raise HTTPException(status_code=404, detail="Profile not found")
-    profile["_id"] = str(profile["_id"])
-    return profile
+    return cached_response(request, response, entry, PersonalProfileResponse)
 
 @api_router.put("/profile", response_model=PersonalProfileResponse)
-async def update_profile(profile: PersonalProfile):
-    profile_dict = profile.dict()
-    profile_dict["updatedAt"] = datetime.utcnow()
-    
-    result = await db.profile.update_one(
-        {},
-        {"$set": profile_dict, "$setOnInsert": {"createdAt": datetime.utcnow()}},
-        upsert=True
+async def update_profile(profile: PersonalProfile, request: Request, response: Response):
+    return await conditional_write(
+        request, response, "profile", {}, profile.dict(), PersonalProfileResponse, ("createdAt", "updatedAt")
     )
-    
-    updated_profile = await db.profile.find_one()
-    updated_profile["_id"] = str(updated_profile["_id"])
-    return updated_profile
 
 # Experience endpoints
 @api_router.get("/experience", response_model=List[ExperienceResponse])
-async def get_experience():
-    experiences = await db.experience.find().sort("order", 1).to_list(100)
-    for exp in experiences:
-        exp["_id"] = str(exp["_id"])
-    return experiences
+async def get_experience(request: Request, response: Response, fields: Optional[str] = None):
+    fields = parse_fields(fields, ExperienceResponse)
+    if fields:
+        entry = await fetch_experience_fields.entry(fields)
+        return rendered_response(request, response, entry, List[sparse_model(ExperienceResponse, fields)])
+    entry = await fetch_experience.entry()
+    return cached_response(request, response, entry, List[ExperienceResponse])
 
 @api_router.post("/experience", response_model=ExperienceResponse)
 async def create_experience(experience: Experience):
     exp_dict = experience.dict()
-    exp_dict["createdAt"] = datetime.utcnow()
-    exp_dict["updatedAt"] = datetime.utcnow()
+    exp_dict["createdAt"] = exp_dict["updatedAt"] = utcnow()
     
-    result = await db.experience.insert_one(exp_dict)
-    created_exp = await db.experience.find_one({"_id": result.inserted_id})
-    created_exp["_id"] = str(created_exp["_id"])
-    return created_exp
+    await db.experience.insert_one(exp_dict)
+    exp_dict["_id"] = str(exp_dict["_id"])
+    notify_write("experience", exp_dict)
+    return exp_dict
+
+@api_router.get("/experience/{item_id}", response_model=ExperienceResponse)
+async def get_experience_item(item_id: str, request: Request, response: Response):
+    return await find_item(request, response, "experience", item_id)
+
+@api_router.put("/experience/{item_id}", response_model=ExperienceResponse)
+async def update_experience(item_id: str, experience: Experience, request: Request, response: Response):
+    return await replace_item(request, response, "experience", item_id, experience)
+
+@api_router.delete("/experience/{item_id}", status_code=204)
+async def delete_experience(item_id: str, request: Request):
+    await delete_item(request, "experience", item_id)
+    return Response(status_code=204)
 
 # Projects endpoints
 @api_router.get("/projects", response_model=List[ProjectResponse])
-async def get_projects():
-    projects = await db.projects.find().sort("createdAt", -1).to_list(100)
-    for project in projects:
-        project["_id"] = str(project["_id"])
-    return projects
+async def get_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    format: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    if after:
+        decode_cursor(after)
+    fields = parse_fields(fields, ProjectResponse)
+    item_model = sparse_model(ProjectResponse, fields) if fields else ProjectResponse
+    # Trimmed payloads do not match the declared response_model, so they are always pre-rendered
+    respond = rendered_response if fields else cached_response
+
+    if wants_ndjson(request, format):
+        return ndjson_response(db.projects, item_model, after, limit, field_projection(fields))
+    if limit is None and after is None:
+        entry = await (fetch_projects_fields.entry(fields) if fields else fetch_projects.entry())
+        return respond(request, response, entry, List[item_model])
+
+    entry = await fetch_projects_page.entry(limit or DEFAULT_PAGE_SIZE, after, fields)
+    next_cursor = entry.value["next_cursor"]
+    return respond(
+        request, response, entry, List[item_model],
+        transform=lambda page: page["items"],
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+    )
 
 @api_router.post("/projects", response_model=ProjectResponse)
 async def create_project(project: Project):
     project_dict = project.dict()
-    project_dict["createdAt"] = datetime.utcnow()
-    project_dict["updatedAt"] = datetime.utcnow()
+    project_dict["createdAt"] = project_dict["updatedAt"] = utcnow()
     
-    result = await db.projects.insert_one(project_dict)
-    created_project = await db.projects.find_one({"_id": result.inserted_id})
-    created_project["_id"] = str(created_project["_id"])
-    return created_project
+    await db.projects.insert_one(project_dict)
+    project_dict["_id"] = str(project_dict["_id"])
+    notify_write("projects", project_dict)
+    return project_dict
 
 @api_router.get("/projects/categories")
-async def get_project_categories():
-    categories = await db.projects.distinct("category")
-    return {"categories": categories}
+async def get_project_categories(request: Request, response: Response):
+    entry = await fetch_project_categories.entry()
+    return cached_response(
+        request, response, entry, Dict[str, List[str]], transform=lambda categories: {"categories": categories}
+    )
+
+@api_router.get("/projects/{item_id}", response_model=ProjectResponse)
+async def get_project(item_id: str, request: Request, response: Response):
+    return await find_item(request, response, "projects", item_id)
+
+@api_router.put("/projects/{item_id}", response_model=ProjectResponse)
+async def update_project(item_id: str, project: Project, request: Request, response: Response):
+    # The uploaded image (and its srcset) only stays while imageUrl still points at it
+    keep_image = {"$cond": [{"$eq": ["$image.src", {"$literal": project.imageUrl}]}, "$image", None]}
+    return await replace_item(request, response, "projects", item_id, project, computed={"image": keep_image})
+
+async def store_upload(file: UploadFile):
+    data = await file.read(MEDIA_MAX_BYTES + 1)
+    if len(data) > MEDIA_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Images are limited to {MEDIA_MAX_BYTES} bytes")
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    try:
+        return await media_pipeline.store(db, data, utcnow)
+    except InvalidImage as exc:
+        raise HTTPException(status_code=415, detail=str(exc))
+    except MediaUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+@api_router.post("/media", response_model=MediaResponse, status_code=201)
+async def upload_media(file: UploadFile = File(...)):
+    return await store_upload(file)
+
+@api_router.put("/projects/{item_id}/image", response_model=ProjectResponse)
+async def set_project_image(item_id: str, request: Request, response: Response, file: UploadFile = File(...)):
+    query = item_query("projects", item_id)
+    if not await db.projects.count_documents(query, limit=1):
+        raise HTTPException(status_code=404, detail="Project not found")
+    image = image_attributes(await store_upload(file))
+    # imageUrl points at the largest WebP so clients that ignore srcset still get the smaller file
+    return await conditional_write(
+        request, response, "projects", query, {"image": image, "imageUrl": image["src"]},
+        ProjectResponse, ("updatedAt",), missing="Project not found",
+    )
+
+@api_router.delete("/projects/{item_id}/image", response_model=ProjectResponse)
+async def delete_project_image(item_id: str, request: Request, response: Response):
+    return await conditional_write(
+        request, response, "projects", item_query("projects", item_id), {"image": None, "imageUrl": None},
+        ProjectResponse, ("updatedAt",), missing="Project not found",
+    )
+
+@api_router.delete("/projects/{item_id}", status_code=204)
+async def delete_project(item_id: str, request: Request):
+    await delete_item(request, "projects", item_id)
+    return Response(status_code=204)
 
 # Skills endpoints
 @api_router.get("/skills", response_model=SkillsResponse)
-async def get_skills():
-    skills = await db.skills.find_one()
-    if not skills:
+async def get_skills(request: Request, response: Response):
+    entry = await fetch_skills.entry()
+    if not entry.value:
         raise HTTPException(status_code=404, detail="Skills not found")
-    skills["_id"] = str(skills["_id"])
-    return skills
+    return cached_response(request, response, entry, SkillsResponse)
 
 @api_router.put("/skills", response_model=SkillsResponse)
-async def update_skills(skills: Skills):
-    skills_dict = skills.dict()
-    skills_dict["updatedAt"] = datetime.utcnow()
-    
-    result = await db.skills.update_one(
-        {},
-        {"$set": skills_dict},
-        upsert=True
+async def update_skills(skills: Skills, request: Request, response: Response):
+    return await conditional_write(request, response, "skills", {}, skills.dict(), SkillsResponse, ("updatedAt",))
+
+@api_router.get("/skills/stats", response_model=SkillStats)
+async def get_skill_stats(request: Request, response: Response, top: int = Query(5, ge=1, le=50)):
+    entry = await fetch_skill_stats.entry(top)
+    return cached_response(request, response, entry, SkillStats)
+
+@api_router.put("/skills/technical", response_model=SkillsResponse)
+async def update_technical_skills(technical: List[TechnicalSkill], request: Request, response: Response):
+    changes = {"technical": [skill.dict() for skill in technical]}
+    return await conditional_write(
+        request, response, "skills", {}, changes, SkillsResponse, ("updatedAt",), missing="Skills not found"
     )
-    
-    updated_skills = await db.skills.find_one()
-    updated_skills["_id"] = str(updated_skills["_id"])
-    return updated_skills
+
+@api_router.put("/skills/soft", response_model=SkillsResponse)
+async def update_soft_skills(soft: List[str], request: Request, response: Response):
+    return await conditional_write(
+        request, response, "skills", {}, {"soft": soft}, SkillsResponse, ("updatedAt",), missing="Skills not found"
+    )
+
+async def update_skill_entry(request, response, condition, update):
+    """Apply ``update`` to the skills document if it matches ``condition``.
+
+    Returns False when it does not; raises 404 when there is no skills
+    document and 412 when the request's preconditions fail.
+    """
+    query = dict(condition)
+    conditional = has_preconditions(request)
+    if conditional:
+        current = await db.skills.find_one()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Skills not found")
+        check_preconditions(request, "skills", current, SkillsResponse)
+        query.update(version_query(current, ()))
+    update = {**update, "$set": {**update.get("$set", {}), "updatedAt": utcnow()}}
+    document = await db.skills.find_one_and_update(query, update, return_document=ReturnDocument.AFTER)
+    if document is None:
+        if not await db.skills.count_documents({}, limit=1):
+            raise HTTPException(status_code=404, detail="Skills not found")
+        if conditional and await db.skills.count_documents(condition, limit=1):
+            raise HTTPException(status_code=412, detail=PRECONDITION_FAILED)
+        return False
+    document["_id"] = str(document["_id"])
+    notify_write("skills", document)
+    response.headers["ETag"] = document_etag(document, SkillsResponse)
+    return True
+
+@api_router.post("/skills/technical", response_model=TechnicalSkill, status_code=201)
+async def add_technical_skill(skill: TechnicalSkill, request: Request, response: Response):
+    if not await update_skill_entry(
+        request, response, {"technical.name": {"$ne": skill.name}}, {"$push": {"technical": skill.dict()}}
+    ):
+        raise HTTPException(status_code=409, detail=f"Skill '{skill.name}' already exists")
+    return skill
+
+@api_router.put("/skills/technical/{name:path}", response_model=TechnicalSkill)
+async def update_technical_skill(name: str, skill: TechnicalSkill, request: Request, response: Response):
+    if skill.name != name and await db.skills.count_documents({"technical.name": skill.name}, limit=1):
+        raise HTTPException(status_code=409, detail=f"Skill '{skill.name}' already exists")
+    # Only matches while the entry differs from the payload, so unchanged entries are not rewritten
+    changed = {"$elemMatch": {"name": name, "$or": [{"name": {"$ne": skill.name}}, {"level": {"$ne": skill.level}}]}}
+    if await update_skill_entry(request, response, {"technical": changed}, {"$set": {"technical.$": skill.dict()}}):
+        return skill
+    if not await db.skills.count_documents({"technical.name": name}, limit=1):
+        raise HTTPException(status_code=404, detail=f"Skill '{name}' not found")
+    return skill
+
+@api_router.delete("/skills/technical/{name:path}", status_code=204)
+async def delete_technical_skill(name: str, request: Request, response: Response):
+    if not await update_skill_entry(request, response, {"technical.name": name}, {"$pull": {"technical": {"name": name}}}):
+        raise HTTPException(status_code=404, detail=f"Skill '{name}' not found")
+    return Response(status_code=204, headers={"ETag": response.headers["ETag"]})
+
+@api_router.post("/skills/soft", response_model=SoftSkill, status_code=201)
+async def add_soft_skill(skill: SoftSkill, request: Request, response: Response):
+    if not await update_skill_entry(request, response, {"soft": {"$ne": skill.name}}, {"$push": {"soft": skill.name}}):
+        raise HTTPException(status_code=409, detail=f"Skill '{skill.name}' already exists")
+    return skill
+
+@api_router.delete("/skills/soft/{name:path}", status_code=204)
+async def delete_soft_skill(name: str, request: Request, response: Response):
+    if not await update_skill_entry(request, response, {"soft": name}, {"$pull": {"soft": name}}):
+        raise HTTPException(status_code=404, detail=f"Skill '{name}' not found")
+    return Response(status_code=204, headers={"ETag": response.headers["ETag"]})
 
 # Certifications endpoints
 @api_router.get("/certifications", response_model=List[CertificationResponse])
-async def get_certifications():
-    certifications = await db.certifications.find().sort("year", -1).to_list(100)
-    for cert in certifications:
-        cert["_id"] = str(cert["_id"])
-    return certifications
+async def get_certifications(request: Request, response: Response):
+    entry = await fetch_certifications.entry()
+    return cached_response(request, response, entry, List[CertificationResponse])
 
 @api_router.post("/certifications", response_model=CertificationResponse)
 async def create_certification(certification: Certification):
     cert_dict = certification.dict()
-    cert_dict["createdAt"] = datetime.utcnow()
-    cert_dict["updatedAt"] = datetime.utcnow()
+    cert_dict["createdAt"] = cert_dict["updatedAt"] = utcnow()
     
-    result = await db.certifications.insert_one(cert_dict)
-    created_cert = await db.certifications.find_one({"_id": result.inserted_id})
-    created_cert["_id"] = str(created_cert["_id"])
-    return created_cert
+    await db.certifications.insert_one(cert_dict)
+    cert_dict["_id"] = str(cert_dict["_id"])
+    notify_write("certifications", cert_dict)
+    return cert_dict
+
+@api_router.get("/certifications/{item_id}", response_model=CertificationResponse)
+async def get_certification(item_id: str, request: Request, response: Response):
+    return await find_item(request, response, "certifications", item_id)
+
+@api_router.put("/certifications/{item_id}", response_model=CertificationResponse)
+async def update_certification(item_id: str, certification: Certification, request: Request, response: Response):
+    return await replace_item(request, response, "certifications", item_id, certification)
+
+@api_router.delete("/certifications/{item_id}", status_code=204)
+async def delete_certification(item_id: str, request: Request):
+    await delete_item(request, "certifications", item_id)
+    return Response(status_code=204)
 
 # Achievements endpoints
 @api_router.get("/achievements", response_model=List[AchievementResponse])
-async def get_achievements():
-    achievements = await db.achievements.find().sort("order", 1).to_list(100)
-    for achievement in achievements:
-        achievement["_id"] = str(achievement["_id"])
-    return achievements
+async def get_achievements(request: Request, response: Response):
+    entry = await fetch_achievements.entry()
+    return cached_response(request, response, entry, List[AchievementResponse])
 
 @api_router.post("/achievements", response_model=AchievementResponse)
 async def create_achievement(achievement: Achievement):
     achievement_dict = achievement.dict()
-    achievement_dict["createdAt"] = datetime.utcnow()
+    achievement_dict["createdAt"] = utcnow()
     
-    result = await db.achievements.insert_one(achievement_dict)
-    created_achievement = await db.achievements.find_one({"_id": result.inserted_id})
-    created_achievement["_id"] = str(created_achievement["_id"])
-    return created_achievement
+    await db.achievements.insert_one(achievement_dict)
+    achievement_dict["_id"] = str(achievement_dict["_id"])
+    notify_write("achievements", achievement_dict)
+    return achievement_dict
+
+@api_router.get("/achievements/{item_id}", response_model=AchievementResponse)
+async def get_achievement(item_id: str, request: Request, response: Response):
+    return await find_item(request, response, "achievements", item_id)
+
+@api_router.put("/achievements/{item_id}", response_model=AchievementResponse)
+async def update_achievement(item_id: str, achievement: Achievement, request: Request, response: Response):
+    return await replace_item(request, response, "achievements", item_id, achievement)
+
+@api_router.delete("/achievements/{item_id}", status_code=204)
+async def delete_achievement(item_id: str, request: Request):
+    await delete_item(request, "achievements", item_id)
+    return Response(status_code=204)
+
+# List collections: collection -> (item model, timestamp fields set on insert, name in errors, response model)
+ITEM_COLLECTIONS = {
+    "experience": (Experience, ("createdAt", "updatedAt"), "Experience", ExperienceResponse),
+    "projects": (Project, ("createdAt", "updatedAt"), "Project", ProjectResponse),
+    "certifications": (Certification, ("createdAt", "updatedAt"), "Certification", CertificationResponse),
+    "achievements": (Achievement, ("createdAt",), "Achievement", AchievementResponse),
+}
+# Collections listed by their ``order`` field
+ORDERED_COLLECTIONS = ("experience", "achievements")
+
+def item_query(collection, item_id):
+    if not ObjectId.is_valid(item_id):
+        raise HTTPException(status_code=404, detail=f"{ITEM_COLLECTIONS[collection][2]} not found")
+    return {"_id": ObjectId(item_id)}
+
+async def find_item(request, response, collection, item_id):
+    """One item with validators, or a 304; its ETag is also what If-Match takes when updating it."""
+    model = ITEM_COLLECTIONS[collection][3]
+    # Read before the item, so a racing write can only leave Last-Modified too old
+    last_modified = response_cache.last_modified((collection,))
+    item = await db[collection].find_one(item_query(collection, item_id))
+    if not item:
+        raise HTTPException(status_code=404, detail=f"{ITEM_COLLECTIONS[collection][2]} not found")
+    item["_id"] = str(item["_id"])
+    if SNAPSHOTS_ENABLED:
+        body = render_json(item, model)
+        return snapshot_response(request, body, bytes_etag(body), last_modified)
+    return conditional(request, response, document_etag(item, model), last_modified) or item
+
+async def replace_item(request, response, collection, item_id, item, computed=None):
+    """Overwrite an item's fields, keeping its position unless ``order`` was sent."""
+    _, timestamps, label, response_model = ITEM_COLLECTIONS[collection]
+    return await conditional_write(
+        request, response, collection, item_query(collection, item_id),
+        item.dict(exclude={"order"} - item.model_fields_set), response_model,
+        tuple(field for field in timestamps if field != "createdAt"), missing=f"{label} not found",
+        computed=computed,
+    )
+
+async def delete_item(request, collection, item_id):
+    _, _, label, response_model = ITEM_COLLECTIONS[collection]
+    query = item_query(collection, item_id)
+    if has_preconditions(request):
+        current = await db[collection].find_one(query)
+        if current is None:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        check_preconditions(request, collection, current, response_model)
+        query = version_query(current, ITEM_COLLECTIONS[collection][0].model_fields)
+    result = await db[collection].delete_one(query)
+    if not result.deleted_count:
+        if has_preconditions(request):
+            raise HTTPException(status_code=412, detail=PRECONDITION_FAILED)
+        raise HTTPException(status_code=404, detail=f"{label} not found")
+    notify_delete(collection, item_id)
+
+@api_router.post("/{collection}/reorder", response_model=ReorderResponse)
+async def reorder_items(collection: str, reorder: ReorderRequest, request: Request):
+    if collection not in ORDERED_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Reordering is not supported for '{collection}'")
+    if len(set(reorder.ids)) != len(reorder.ids):
+        raise HTTPException(status_code=400, detail="Each id may appear only once")
+    if has_preconditions(request):
+        # Validators are those of GET /api/{collection}, read fresh rather than from the cache
+        items = await PORTFOLIO_SECTIONS[collection].uncached()
+        etag = document_etag(items, List[ITEM_COLLECTIONS[collection][3]])
+        if precondition_failed(request, etag, response_cache.last_modified((collection,))):
+            raise HTTPException(status_code=412, detail=PRECONDITION_FAILED)
+
+    current = {str(doc["_id"]): doc for doc in await db[collection].find({}, {"order": 1}).to_list(None)}
+    missing, unknown = set(current) - set(reorder.ids), set(reorder.ids) - set(current)
+    if missing or unknown:
+        # The client's list is stale: items were added or removed since it was fetched
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "ids must list every item exactly once", "missing": sorted(missing), "unknown": sorted(unknown)}
+        )
+
+    now = utcnow()
+    stamp = {"updatedAt": now} if "updatedAt" in ITEM_COLLECTIONS[collection][1] else {}
+    # Only items whose position changes are written, all in one command
+    moved = [
+        (current[item_id]["_id"], position)
+        for position, item_id in enumerate(reorder.ids, start=1)
+        if current[item_id].get("order") != position
+    ]
+    if moved:
+        await db[collection].bulk_write(
+            [UpdateOne({"_id": doc_id}, {"$set": {"order": position, **stamp}}) for doc_id, position in moved],
+            ordered=False,
+        )
+        response_cache.invalidate(collection)
+        announce(make_event(collection, (doc_id for doc_id, _ in moved)))
+    return {"modified": len(moved)}
+
+MAX_BULK_ITEMS = int(os.environ.get('MAX_BULK_ITEMS', '10000'))
+
+@api_router.post("/{collection}/bulk", response_model=BulkWriteResponse, response_model_exclude_none=True)
+async def bulk_create(collection: str, items: List[Dict[str, Any]] = Body(...)):
+    if collection not in ITEM_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Bulk writes are not supported for '{collection}'")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    model, timestamp_fields, _, _ = ITEM_COLLECTIONS[collection]
+
+    now = utcnow()
+    results = [None] * len(items)
+    documents, positions = [], []
+    for index, item in enumerate(items):
+        try:
+            document = model.model_validate(item).dict()
+        except ValidationError as exc:
+            errors = [{"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]} for error in exc.errors()]
+            results[index] = BulkItemResult(index=index, status="invalid", errors=errors)
+            continue
+        for field in timestamp_fields:
+            document[field] = now
+        documents.append(document)
+        positions.append(index)
+
+    write_errors = {}
+    if documents:
+        try:
+            await db[collection].insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            write_errors = {error["index"]: error for error in exc.details.get("writeErrors", [])}
+
+    for batch_index, (index, document) in enumerate(zip(positions, documents)):
+        if batch_index in write_errors:
+            error = write_errors[batch_index]
+            results[index] = BulkItemResult(
+                index=index, status="failed", errors=[{"msg": error.get("errmsg"), "type": str(error.get("code"))}]
+            )
+        else:
+            results[index] = BulkItemResult(index=index, status="inserted", id=str(document["_id"]))
+
+    if documents:
+        notify_write(collection, *(
+            document for batch_index, document in enumerate(documents) if batch_index not in write_errors
+        ))
+
+    inserted = sum(1 for result in results if result.status == "inserted")
+    return BulkWriteResponse(inserted=inserted, failed=len(items) - inserted, results=results)
 
 # Contact endpoints
 @api_router.post("/contact", response_model=ContactMessageResponse)
-async def submit_contact(contact: ContactMessage):
+async def submit_contact(contact: ContactMessage, request: Request):
+    client_ip = request.client.host if request.client else None
+    retry_after = await contact_limiter.check(f"ip:{client_ip}", f"email:{contact.email.lower()}")
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many messages. Please try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
     contact_dict = contact.dict()
+    contact_dict["_id"] = ObjectId()
     contact_dict["isRead"] = False
-    contact_dict["createdAt"] = datetime.utcnow()
+    contact_dict["createdAt"] = utcnow()
     
-    result = await db.contact_messages.insert_one(contact_dict)
-    created_message = await db.contact_messages.find_one({"_id": result.inserted_id})
-    created_message["_id"] = str(created_message["_id"])
-    return created_message
+    # The buffer owns the queued document; fall back to a direct write when
+    # it is full or not running
+    if not contact_buffer.submit(contact_dict):
+        await db.contact_messages.insert_one(contact_dict)
+    return {**contact_dict, "_id": str(contact_dict["_id"])}
 
 @api_router.get("/contact", response_model=List[ContactMessageResponse])
-async def get_contact_messages():
-    messages = await db.contact_messages.find().sort("createdAt", -1).to_list(100)
-    for message in messages:
-        message["_id"] = str(message["_id"])
+async def get_contact_messages(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    format: Optional[str] = None,
+    archived: bool = False,
+):
+    collection = db[ARCHIVE_COLLECTION] if archived else db.contact_messages
+    if after:
+        decode_cursor(after)
+    if wants_ndjson(request, format):
+        # Exports stream the whole inbox unless the caller asks for a limit
+        export_limit = limit if "limit" in request.query_params else None
+        return ndjson_response(collection, ContactMessageResponse, after, export_limit)
+
+    messages, next_cursor = await fetch_page(collection, limit, after)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return messages
 
-# Include the router in the main app
-app.include_router(api_router)
+@api_router.get("/contact/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count():
+    # Counted from the isRead_createdAt index without touching documents
+    return {"unread": await db.contact_messages.count_documents({"isRead": False})}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def contact_changes(update: ContactMessageUpdate) -> Dict[str, Any]:
+    if update.archived is False:
+        raise HTTPException(status_code=400, detail="Archived messages cannot be restored")
+    changes = {"isRead": update.isRead} if update.isRead is not None else {}
+    if not changes and not update.archived:
+        raise HTTPException(status_code=400, detail="Nothing to update: set isRead and/or archived")
+    return changes
+
+@api_router.patch("/contact/{message_id}", response_model=ContactMessageResponse)
+async def update_contact_message(message_id: str, update: ContactMessageUpdate):
+    changes = contact_changes(update)
+    if not ObjectId.is_valid(message_id):
+        raise HTTPException(status_code=404, detail="Message not found")
+    query = {"_id": ObjectId(message_id)}
+
+    if update.archived:
+        if not await archive_messages(db, query, utcnow, changes):
+            raise HTTPException(status_code=404, detail="Message not found")
+        message = await db[ARCHIVE_COLLECTION].find_one(query)
+    else:
+        message = await db.contact_messages.find_one_and_update(
+            query, {"$set": changes}, return_document=ReturnDocument.AFTER
+        )
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
+    message["_id"] = str(message["_id"])
+    return message
+
+@api_router.patch("/contact", response_model=ContactBulkUpdateResponse)
+async def bulk_update_contact_messages(update: ContactBulkUpdate):
+    changes = contact_changes(update)
+    query = message_filter(update.filter.ids, update.filter.isRead, update.filter.email, update.filter.before)
+    if not query and not update.filter.all:
+        raise HTTPException(
+            status_code=400, detail='The filter matches every message; send "all": true to update the whole inbox'
+        )
+    if query and update.filter.all:
+        raise HTTPException(status_code=400, detail='"all" cannot be combined with other filter fields')
+
+    if update.archived:
+        archived = await archive_messages(db, query, utcnow, changes)
+        return {"matched": archived, "modified": archived, "archived": archived}
+    result = await db.contact_messages.update_many(query, {"$set": changes})
+    return {"matched": result.matched_count, "modified": result.modified_count, "archived": 0}
+
+# Search endpoint
+@api_router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = "",
+    type: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None),
+    tech: Optional[List[str]] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    await ensure_search_index()
+    filters = {"type": type, "category": category, "tech": tech, "status": status}
+    return search_index.search(q, filters, limit=limit, offset=offset)
+
+# Cache endpoints
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    return response_cache.stats()
+
+# Event stream endpoint
+@api_router.get("/events")
+async def stream_events(collections: Optional[str] = None):
+    names = None
+    if collections:
+        names = [name.strip() for name in collections.split(",") if name.strip()]
+        unknown = [name for name in names if name not in CONTENT_COLLECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown collections: {', '.join(unknown)}. "
+                       f"Valid collections: {', '.join(CONTENT_COLLECTIONS)}"
+            )
+    if event_broker.full:
+        raise HTTPException(status_code=503, detail="Too many event stream clients", headers={"Retry-After": "30"})
+    subscription = event_broker.subscribe(names)
+    return StreamingResponse(
+        event_stream(event_broker, subscription, SSE_HEARTBEAT_SECONDS, SSE_MAX_SECONDS, retry_ms=3000),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Health endpoint
+@api_router.get("/health")
+async def get_health(response: Response):
+    try:
+        database = {"status": "ok", "latencyMs": round(await ping(db, PING_TIMEOUT), 2)}
+    except Exception as e:
+        database = {"status": "unavailable", "error": str(e) or type(e).__name__}
+        response.status_code = 503
+    if client is not None:
+        options = client.options.pool_options
+        pool = {"maxPoolSize": options.max_pool_size, "minPoolSize": options.min_pool_size}
+    else:
+        # A database set by set_database(); report the configured sizes
+        options = client_options()
+        pool = {"maxPoolSize": options["maxPoolSize"], "minPoolSize": options["minPoolSize"]}
+    return {
+        "status": "ok" if database["status"] == "ok" else "degraded",
+        "database": database,
+        "pool": {**pool, "workers": worker_count()},
+        "warm": warmup_done.is_set(),
+        "searchIndexReady": search_index.ready,
+        "invalidationBus": INVALIDATION_BUS,
+    }
+
+# Metrics endpoint
+def collect_app_metrics():
+    stats = response_cache.stats()
+    yield "response_cache_hits_total", {}, stats["hits"]
+    yield "response_cache_misses_total", {}, stats["misses"]
+    yield "response_cache_hit_ratio", {}, stats["hitRatio"]
+    yield "response_cache_entries", {}, stats["entries"]
+    yield "response_cache_invalidations_total", {}, stats["invalidations"]
+    yield "contact_rate_limited_total", {}, contact_limiter.rejected
+    for name, value in contact_buffer.stats.items():
+        yield "contact_buffer_events_total", {"event": name}, value
+    yield "search_index_documents", {}, len(search_index)
+    yield "sse_subscribers", {}, len(event_broker)
+    for name, value in event_broker.stats.items():
+        yield "sse_events_total", {"event": name}, value
+    for name, value in getattr(invalidation_bus, "stats", {}).items():
+        yield "invalidation_bus_events_total", {"event": name}, value
+
+metrics_registry.add_collector(collect_app_metrics, {
+    "response_cache_hits_total": ("counter", "Response cache lookups served from memory."),
+    "response_cache_misses_total": ("counter", "Response cache lookups that loaded from MongoDB."),
+    "response_cache_hit_ratio": ("gauge", "Hits over all lookups since startup."),
+    "response_cache_entries": ("gauge", "Entries currently held by the response cache."),
+    "response_cache_invalidations_total": ("counter", "Collection invalidations triggered by writes."),
+    "contact_rate_limited_total": ("counter", "Contact submissions rejected by the rate limiter."),
+    "contact_buffer_events_total": ("counter", "Contact write-buffer messages queued, written and failed, and batches flushed."),
+    "search_index_documents": ("gauge", "Documents in the search index."),
+    "sse_subscribers": ("gauge", "Open /api/events streams."),
+    "sse_events_total": ("counter", "Events published, delivered to subscribers, and subscribers dropped as too slow."),
+    "invalidation_bus_events_total": ("counter", "Write events published to and received from other workers, and resets."),
+})
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+def configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+async def warm_up():
+    """Index bootstrap, cache priming and search index build, off the startup path."""
+    try:
+        await ensure_indexes(db)
+        if explain_enabled():
+            await log_query_plans(db)
+    except Exception:
+        logger.exception("Index bootstrap failed; continuing without it")
+    try:
+        await ensure_archive_ttl(db)
+    except Exception:
+        logger.exception("Could not apply the contact archive TTL")
+    for name, loader in PORTFOLIO_SECTIONS.items():
+        try:
+            await loader.entry()
+        except Exception:
+            logger.exception("Priming the %s cache failed; it will load on first request", name)
+    try:
+        await ensure_search_index()
+    except Exception:
+        logger.exception("Search index build failed; it will be retried on the first search")
+    warmup_done.set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Only the ping holds up startup; it opens the first pooled connection and
+    # surfaces a bad MONGO_URL right away. The rest warms up in the background.
+    connect()
+    try:
+        latency = await ping(db, PING_TIMEOUT)
+        if client is not None:
+            pool = client.options.pool_options
+            logger.info(
+                "MongoDB ping %.1f ms; pool min %d / max %d for %d worker(s)",
+                latency, pool.min_pool_size, pool.max_pool_size, worker_count(),
+            )
+    except Exception:
+        logger.exception("MongoDB ping failed at startup; see /api/health")
+    contact_buffer.start()
+    await invalidation_bus.start()
+    background = [asyncio.create_task(warm_up(), name="warm-up")]
+    if ARCHIVE_AFTER_DAYS > 0:
+        background.append(asyncio.create_task(run_retention(db, utcnow), name="contact-retention"))
+    try:
+        yield
+    finally:
+        event_broker.close()
+        for task in background:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await contact_buffer.stop()
+        await invalidation_bus.stop()
+        media_pipeline.close()
+        if client is not None:
+            client.close()
+
+async def get_metrics():
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+def create_app() -> FastAPI:
+    """Build the ASGI app.
+
+    Importing this module opens no connections and starts no threads; the
+    MongoDB client, cache warm-up and invalidation bus start in ``lifespan``.
+    The caches, metrics and event broker are module-level, so run one app
+    per process.
+    """
+    configure_logging()
+    application = FastAPI(lifespan=lifespan)
+    application.add_api_route("/metrics", get_metrics, methods=["GET"], include_in_schema=False)
+    application.include_router(api_router)
+
+    if MEDIA_STORAGE == "local":
+        application.mount(MEDIA_PATH, ImmutableStaticFiles(directory=MEDIA_ROOT, check_dir=False), name="media")
+
+    application.add_middleware(CompressionMiddleware)
+
+    application.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
+    )
+
+    # Outermost, so timings and sizes cover CORS and compression too
+    application.add_middleware(MetricsMiddleware)
+    return application
+
+def __getattr__(name):
+    # ``server:app`` (uvicorn, tests, scripts) builds the app on first access
+    global app
+    if name == "app":
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+"""Pre-rendered JSON snapshots of cached GET responses.
+
+With snapshot mode on (``RESPONSE_SNAPSHOTS``, the default), each cache
+entry is validated against its response model and encoded to JSON bytes the
+first time it is served. Later requests reuse those bytes, so per-request
+work is a cache lookup plus a header check. A write invalidates the entry,
+and the next read renders the new snapshot. orjson is used when installed;
+otherwise pydantic's own JSON encoder is used. Compressed variants are
+cached by ETag (see ``compression``), so they are also built only once.
+"""
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from cache import CacheEntry
+from compression import compressed_variant, encoded_etag
+from conditional import (
+    bytes_etag, conditional_entry, content_etag, entry_last_modified, is_not_modified, revalidated_etag, validator_headers,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SNAPSHOTS_ENABLED = os.environ.get("RESPONSE_SNAPSHOTS", "1").lower() not in ("0", "false", "no")
+
+
+class SnapshotResponse(Response):
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def type_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def render_json(value: Any, annotation: Any) -> bytes:
+    """Validate ``value`` against ``annotation`` once and encode it to JSON bytes."""
+    adapter = type_adapter(annotation)
+    validated = adapter.validate_python(value)
+    if orjson is not None:
+        return orjson.dumps(adapter.dump_python(validated, by_alias=True))
+    return adapter.dump_json(validated, by_alias=True)
+
+
+def document_etag(document: Any, annotation: Any) -> str:
+    """The ETag a GET would send for ``document`` in the current snapshot mode."""
+    if SNAPSHOTS_ENABLED:
+        return bytes_etag(render_json(document, annotation))
+    return content_etag(document)
+
+
+def entry_snapshot(
+    entry: CacheEntry,
+    annotation: Any,
+    transform: Optional[Callable[[Any], Any]] = None,
+) -> Tuple[bytes, str]:
+    """Rendered body and its ETag for ``entry``, built at most once per entry."""
+    body = entry.memo("body", lambda value: render_json(transform(value) if transform else value, annotation))
+    etag = entry.memo("body_etag", lambda _: bytes_etag(body))
+    return body, etag
+
+
+def snapshot_response(
+    request: Request,
+    body: Union[bytes, Callable[[], bytes]],
+    etag: str,
+    last_modified=None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Send ``body`` with validators, or a 304; a callable body is only rendered when sent."""
+    validators = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(
+            status_code=304, headers={**validators, "ETag": revalidated_etag(request, etag), "Vary": "Accept-Encoding"}
+        )
+    if callable(body):
+        body = body()
+    body, encoding = compressed_variant(request.headers.get("accept-encoding", ""), etag, body)
+    response_headers = {**validators, **(headers or {}), "Vary": "Accept-Encoding"}
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+        response_headers["ETag"] = encoded_etag(etag, encoding)
+    return SnapshotResponse(content=body, headers=response_headers)
+
+
+def rendered_response(
+    request: Request,
+    response: Response,
+    entry: CacheEntry,
+    annotation: Any,
+    transform: Optional[Callable[[Any], Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Answer a GET from the entry's snapshot, whether or not snapshot mode is on.
+
+    Used directly by routes whose payload does not fit their declared
+    response_model, such as sparse fieldsets.
+    """
+    body, etag = entry_snapshot(entry, annotation, transform)
+    return snapshot_response(request, body, etag, entry_last_modified(entry), headers)
+
+
+def cached_response(
+    request: Request,
+    response: Response,
+    entry: CacheEntry,
+    annotation: Any,
+    transform: Optional[Callable[[Any], Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+):
+    """Answer a GET from a cache entry.
+
+    In snapshot mode the stored bytes are sent directly. Otherwise the value
+    goes back to FastAPI for the usual response_model serialization.
+    """
+    if SNAPSHOTS_ENABLED:
+        return rendered_response(request, response, entry, annotation, transform, headers)
+
+    response.headers.update(headers or {})
+    return conditional_entry(request, response, entry) or (transform(entry.value) if transform else entry.value)
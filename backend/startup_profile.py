@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Measure how long a fresh worker takes to import the API and build the app.
+
+Each run starts a new interpreter that executes ``import server`` and
+``server.create_app()`` under ``python -X importtime``. MONGO_URL and
+DB_NAME are removed from its environment, and a run fails if importing
+the app needs them or loads the MongoDB driver. The report shows the slowest imports,
+by cumulative and by self time. The wall-clock median over all runs,
+interpreter start-up included, is compared against the cold-start budget.
+
+    python startup_profile.py
+    python startup_profile.py --runs 10 --budget-ms 600 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "1000"))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import server
+imported = time.perf_counter()
+server.create_app()
+built = time.perf_counter()
+print(json.dumps({
+    "importMs": (imported - start) * 1000,
+    "createAppMs": (built - imported) * 1000,
+    "connected": server.db is not None or "motor" in sys.modules,
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """``-X importtime`` lines as dicts with self/cumulative milliseconds and nesting depth."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "selfMs": int(self_us) / 1000,
+            "cumulativeMs": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def server_imports(modules):
+    """Modules imported directly by server.py (depth 1 under it), with everything they pulled in."""
+    direct, pending = [], []
+    for module in modules:
+        # -X importtime lists a module after everything it imported
+        if module["depth"] == 1:
+            pending.append(module)
+        elif module["depth"] == 0:
+            if module["module"] == "server":
+                direct.extend(pending)
+            pending = []
+    return direct
+
+
+def probe_once():
+    env = {key: value for key, value in os.environ.items() if key not in ("MONGO_URL", "DB_NAME")}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"importing the app failed:\n{result.stderr.strip().splitlines()[-1]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    if timings.pop("connected"):
+        raise RuntimeError("importing the app created a MongoDB client; it should connect in the lifespan")
+    return {"wallMs": wall_ms, **timings}, parse_importtime(result.stderr)
+
+
+def profile(runs, top):
+    samples, modules = [], []
+    for _ in range(runs):
+        sample, modules = probe_once()
+        samples.append(sample)
+    # Module timings come from the last run, after the first has warmed the OS file cache
+    top_level = sorted(server_imports(modules), key=lambda m: m["cumulativeMs"], reverse=True)
+    by_self = sorted(modules, key=lambda m: m["selfMs"], reverse=True)
+    return {
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "medianMs": {key: round(statistics.median(s[key] for s in samples), 1)
+                     for key in ("wallMs", "importMs", "createAppMs")},
+        "maxWallMs": round(max(s["wallMs"] for s in samples), 1),
+        "modules": len(modules),
+        "topCumulative": top_level[:top],
+        "topSelf": by_self[:top],
+    }
+
+
+def print_report(report, budget_ms):
+    median = report["medianMs"]
+    print("=" * 72)
+    print(f"⏱️  Cold start over {report['runs']} run(s), Python {report['python']}, {report['modules']} modules imported")
+    print(f"   process wall  {median['wallMs']:>8.1f} ms median  (max {report['maxWallMs']:.1f} ms, budget {budget_ms:.0f} ms)")
+    print(f"   import server {median['importMs']:>8.1f} ms")
+    print(f"   create_app()  {median['createAppMs']:>8.1f} ms")
+    for title, key, rows in (("Imports made by server.py, by cumulative time", "cumulativeMs", report["topCumulative"]),
+                             ("Modules by self time", "selfMs", report["topSelf"])):
+        print("-" * 72)
+        print(f"{title:<56}{'ms':>16}")
+        for row in rows:
+            print(f"  {row['module']:<54}{row[key]:>16.1f}")
+    print("=" * 72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time profile and cold-start budget check for the API")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="modules listed per table (default 15)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail when the median cold start exceeds this (default STARTUP_BUDGET_MS or 1000)")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        report = profile(max(1, args.runs), args.top)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    report["budgetMs"] = args.budget_ms
+    print_report(report, args.budget_ms)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"💾 Report written to {args.output}")
+
+    if report["medianMs"]["wallMs"] > args.budget_ms:
+        print(f"⚠️  Median cold start {report['medianMs']['wallMs']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print("✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Backend Load Test & Latency Benchmark for Space-themed Portfolio
+Replays the endpoints covered by backend_test.py as a mixed read/write
+workload and reports p50/p95/p99 latency, throughput and allocations per endpoint
+
+By default the app runs in-process against mongomock-motor, seeded from
+seed_db.MOCK_DATA, so no server or MongoDB is needed. Pass --base-url to
+benchmark a running deployment instead.
+
+    python backend_bench.py --requests 5000 --concurrency 32 --output bench_baseline.json
+    python backend_bench.py --compare bench_baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from backend_test import ENDPOINTS
+
+ROOT_DIR = Path(__file__).parent
+
+# Writes that invalidate cached reads, so the mix exercises cache rebuilds
+# as well as the contact inbox
+EXTRA_WRITES = [
+    ("PUT", "/profile", None),
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def label(method, path):
+    return f"{method} /api{path}"
+
+
+async def in_process_client():
+    """Build an httpx client bound to the FastAPI app over a seeded mongomock database"""
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "portfolio_bench")
+    # The contact form is rate limited per client; every benchmark request comes from one address
+    os.environ.setdefault("CONTACT_RATE_BURST", "1000000000")
+    sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        print("❌ mongomock-motor is required for in-process benchmarks (pip install mongomock-motor)")
+        sys.exit(1)
+
+    import seed_db
+    import server
+
+    db = AsyncMongoMockClient()[os.environ["DB_NAME"]]
+    seed_db.db = db
+    server.set_database(db)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await seed_db.seed_database()
+
+    transport = httpx.ASGITransport(app=server.app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    return client, server.app
+
+
+def build_workload():
+    reads = [endpoint for endpoint in ENDPOINTS if endpoint[0] == "GET"]
+    writes = [endpoint for endpoint in ENDPOINTS if endpoint[0] != "GET"] + EXTRA_WRITES
+    return reads, writes
+
+
+async def resolve_payloads(client, writes):
+    """Fill in bodies for writes that replay the current document (PUT /profile)"""
+    resolved = []
+    for method, path, body in writes:
+        if body is None:
+            response = await client.get(f"/api{path}")
+            response.raise_for_status()
+            body = {key: value for key, value in response.json().items() if key not in ("_id", "createdAt", "updatedAt")}
+        resolved.append((method, path, body))
+    return resolved
+
+
+async def send(client, method, path, body):
+    return await client.request(method, f"/api{path}", json=body)
+
+
+async def run_load(client, reads, writes, total, concurrency, write_ratio, rng):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            # In-process, the app shares this event loop and a cache hit never
+            # yields; without this one worker would run many requests in a row
+            # while the others wait, and their latencies would measure the wait
+            await asyncio.sleep(0)
+            method, path, body = rng.choice(writes if writes and rng.random() < write_ratio else reads)
+            start = time.perf_counter()
+            try:
+                response = await send(client, method, path, body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[label(method, path)].append((time.perf_counter() - start) * 1000)
+            if failed:
+                errors[label(method, path)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def measure_allocations(client, endpoints, samples):
+    """Peak traced allocation per request, measured sequentially so requests don't overlap"""
+    results = {}
+    tracemalloc.start()
+    try:
+        for method, path, body in endpoints:
+            peaks = []
+            for _ in range(samples):
+                tracemalloc.reset_peak()
+                baseline, _ = tracemalloc.get_traced_memory()
+                await send(client, method, path, body)
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(max(0, peak - baseline))
+            results[label(method, path)] = sum(peaks) / len(peaks) / 1024
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def summarize(latencies, errors, elapsed, allocations):
+    endpoints = {}
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        endpoints[name] = {
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+            "rps": round(len(values) / elapsed, 1),
+            "alloc_kb": round(allocations.get(name, 0.0), 1),
+        }
+    everything = sorted(value for values in latencies.values() for value in values)
+    total = {
+        "count": len(everything),
+        "errors": sum(errors.values()),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(everything) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(everything, 50), 3),
+        "p95_ms": round(percentile(everything, 95), 3),
+        "p99_ms": round(percentile(everything, 99), 3),
+    }
+    return endpoints, total
+
+
+def print_report(endpoints, total):
+    print("=" * 96)
+    print(f"{'Endpoint':<32}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'alloc KB':>10}")
+    print("-" * 96)
+    for name, stats in endpoints.items():
+        print(
+            f"{name:<32}{stats['count']:>8}{stats['errors']:>6}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['rps']:>10.1f}{stats['alloc_kb']:>10.1f}"
+        )
+    print("-" * 96)
+    print(
+        f"{'TOTAL':<32}{total['count']:>8}{total['errors']:>6}{total['p50_ms']:>10.2f}"
+        f"{total['p95_ms']:>10.2f}{total['p99_ms']:>10.2f}{total['rps']:>10.1f}"
+    )
+    print("=" * 96)
+
+
+def compare(report, baseline, tolerance, min_delta_ms=1.0):
+    """Return regressions: p95 latency, throughput or allocations worse than the baseline by more than tolerance
+
+    Latency changes smaller than min_delta_ms are ignored; sub-millisecond
+    percentiles move by more than any sensible tolerance between runs.
+    """
+    regressions = []
+    for name, stats in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_worse in (("p95_ms", True), ("alloc_kb", True), ("rps", False)):
+            old, new = previous.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            if metric == "p95_ms" and new - old < min_delta_ms:
+                continue
+            change = (new - old) / old if higher_is_worse else (old - new) / old
+            if change > tolerance:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url.rstrip("/"), timeout=30)
+        lifespan = contextlib.nullcontext()
+    else:
+        client, app = await in_process_client()
+        lifespan = app.router.lifespan_context(app)
+
+    async with lifespan:
+        async with client:
+            reads, writes = build_workload()
+            writes = await resolve_payloads(client, writes)
+
+            print(f"🚀 Benchmarking {len(reads)} read / {len(writes)} write endpoints")
+            print(f"📡 Target: {args.base_url or 'in-process app (mongomock-motor)'}")
+            print(f"⚙️  {args.requests} requests, concurrency {args.concurrency}, write ratio {args.write_ratio}")
+
+            if args.warmup:
+                await run_load(client, reads, writes, args.warmup, args.concurrency, args.write_ratio, rng)
+            latencies, errors, elapsed = await run_load(
+                client, reads, writes, args.requests, args.concurrency, args.write_ratio, rng
+            )
+            allocations = {}
+            if args.alloc_samples and not args.base_url:
+                allocations = await measure_allocations(client, reads + writes, args.alloc_samples)
+
+    endpoints, total = summarize(latencies, errors, elapsed, allocations)
+    print_report(endpoints, total)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.base_url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "write_ratio": args.write_ratio,
+            "seed": args.seed,
+        },
+        "endpoints": endpoints,
+        "total": total,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  • {regression}")
+            return False
+        print(f"\n🎉 No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return total["errors"] == 0 or args.allow_errors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test and latency benchmark for the portfolio API")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests (default 2000)")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured warm-up requests (default 200)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients (default 16)")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="share of requests that are writes (default 0.05)")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="sequential requests per endpoint for allocation tracing; 0 disables")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the request mix")
+    parser.add_argument("--base-url", help="benchmark a running server (e.g. http://localhost:8001) instead of the in-process app")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore p95 increases smaller than this (default 1.0)")
+    parser.add_argument("--allow-errors", action="store_true", help="do not fail the run on HTTP errors")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main(parse_args()))
+    sys.exit(0 if success else 1)
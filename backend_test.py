@@ -5,8 +5,10 @@ Tests all backend endpoints for proper functionality and data integrity
 """
 
 import requests
+import base64
 import json
 import sys
+import time
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -16,12 +18,35 @@ load_dotenv('/app/frontend/.env')
 
 # Get backend URL from environment
 BACKEND_URL = os.getenv('REACT_APP_BACKEND_URL')
-if not BACKEND_URL:
-    print("❌ REACT_APP_BACKEND_URL not found in environment")
-    sys.exit(1)
 
 API_BASE = f"{BACKEND_URL}/api"
 
+SAMPLE_CONTACT = {
+    "name": "John Doe",
+    "email": "john.doe@example.com",
+    "subject": "Portfolio Inquiry",
+    "message": "Hello, I'm interested in your work and would like to discuss potential opportunities."
+}
+
+# Smallest useful upload: a 2x2 red PNG
+SAMPLE_IMAGE = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAIAAAACCAIAAAD91JpzAAAAFklEQVR4nGP8z8DAwMDAxMDAwMDAAAANHQEDasKb6QAAAABJRU5ErkJggg=="
+)
+
+# Endpoints covered by this suite as (method, path, JSON body);
+# backend_bench.py replays the same list as a load test
+ENDPOINTS = [
+    ("GET", "/profile", None),
+    ("GET", "/experience", None),
+    ("GET", "/projects", None),
+    ("GET", "/projects/categories", None),
+    ("GET", "/skills", None),
+    ("GET", "/certifications", None),
+    ("GET", "/achievements", None),
+    ("GET", "/portfolio", None),
+    ("POST", "/contact", SAMPLE_CONTACT),
+]
+
 class PortfolioAPITester:
     def __init__(self):
         self.results = {
@@ -121,6 +146,116 @@ class PortfolioAPITester:
         except requests.exceptions.RequestException as e:
             self.log_result("GET /api/projects", False, f"Request failed: {str(e)}")
     
+    def test_projects_pagination(self):
+        """Test keyset pagination of GET /api/projects via X-Next-Cursor, bad cursors and NDJSON"""
+        try:
+            expected = [project['_id'] for project in requests.get(f"{API_BASE}/projects", timeout=10).json()]
+            seen, params = [], {'limit': 2}
+            for _ in range(len(expected) + 1):
+                response = requests.get(f"{API_BASE}/projects", params=params, timeout=10)
+                if response.status_code != 200:
+                    break
+                seen.extend(project['_id'] for project in response.json())
+                cursor = response.headers.get('X-Next-Cursor')
+                if not cursor:
+                    break
+                params = {'limit': 2, 'after': cursor}
+            if response.status_code == 200 and seen == expected:
+                self.log_result("GET /api/projects?limit (pages)", True, f"{len(seen)} projects across pages, no duplicates or gaps")
+            else:
+                self.log_result("GET /api/projects?limit (pages)", False, f"HTTP {response.status_code}, paged {seen} vs {expected}")
+
+            response = requests.get(f"{API_BASE}/projects", params={'limit': 2, 'after': 'not-a-cursor'}, timeout=10)
+            if response.status_code == 400:
+                self.log_result("GET /api/projects (bad cursor)", True, "Invalid cursor rejected")
+            else:
+                self.log_result("GET /api/projects (bad cursor)", False, f"Expected 400, got HTTP {response.status_code}")
+
+            response = requests.get(f"{API_BASE}/projects", params={'format': 'ndjson'}, timeout=10)
+            lines = [line for line in response.text.splitlines() if line.strip()]
+            ids = [json.loads(line)['_id'] for line in lines]
+            if response.status_code == 200 and ids == expected:
+                self.log_result("GET /api/projects?format=ndjson", True, f"{len(lines)} lines")
+            else:
+                self.log_result("GET /api/projects?format=ndjson", False, f"HTTP {response.status_code}, {len(lines)} lines for {len(expected)} projects")
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.log_result("Projects pagination", False, f"Request failed: {str(e)}")
+
+    def test_search(self):
+        """Test GET /api/search ranking, facets and that writes reach the index"""
+        try:
+            project = {
+                'title': 'Quasarfind telemetry explorer', 'description': 'Search test project',
+                'technologies': ['Python'], 'status': 'Completed', 'category': 'Data',
+            }
+            response = requests.post(f"{API_BASE}/projects", json=project, timeout=10)
+            if response.status_code != 200:
+                self.log_result("GET /api/search", False, f"Could not create test project: HTTP {response.status_code}")
+                return
+            project_id = response.json()['_id']
+
+            response = requests.get(f"{API_BASE}/search", params={'q': 'quasarf', 'type': 'projects'}, timeout=10)
+            data = response.json() if response.status_code == 200 else {}
+            ids = [hit['id'] for hit in data.get('hits', [])]
+            if ids == [project_id] and data.get('facets', {}).get('category', {}).get('Data') == 1:
+                self.log_result("GET /api/search", True, "Prefix match with facets")
+            else:
+                self.log_result("GET /api/search", False, f"HTTP {response.status_code}: {response.text}")
+
+            requests.delete(f"{API_BASE}/projects/{project_id}", timeout=10)
+            response = requests.get(f"{API_BASE}/search", params={'q': 'quasarfind'}, timeout=10)
+            if response.status_code == 200 and response.json()['total'] == 0:
+                self.log_result("GET /api/search (after delete)", True, "Deleted project no longer matches")
+            else:
+                self.log_result("GET /api/search (after delete)", False, f"HTTP {response.status_code}: {response.text}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("GET /api/search", False, f"Request failed: {str(e)}")
+
+    def test_sparse_fields(self):
+        """Test ?fields= on GET /api/projects and /api/experience, with paging, NDJSON and unknown fields"""
+        try:
+            for path, fields in (('projects', ['title', 'category']), ('experience', ['title', 'company'])):
+                response = requests.get(f"{API_BASE}/{path}", params={'fields': ','.join(fields)}, timeout=10)
+                keys = {frozenset(item) for item in response.json()} if response.status_code == 200 else None
+                if keys and keys <= {frozenset(['_id', *fields])} and all('_id' in key for key in keys):
+                    self.log_result(f"GET /api/{path}?fields", True, f"Only _id, {', '.join(fields)}")
+                else:
+                    self.log_result(f"GET /api/{path}?fields", False, f"HTTP {response.status_code}, keys {keys}")
+
+            expected = [(project['_id'], project['title']) for project in requests.get(f"{API_BASE}/projects", timeout=10).json()]
+            seen, params = [], {'limit': 2, 'fields': 'title'}
+            for _ in range(len(expected) + 1):
+                response = requests.get(f"{API_BASE}/projects", params=params, timeout=10)
+                if response.status_code != 200:
+                    break
+                seen.extend((project['_id'], project['title']) for project in response.json() if set(project) == {'_id', 'title'})
+                cursor = response.headers.get('X-Next-Cursor')
+                if not cursor:
+                    break
+                params = {**params, 'after': cursor}
+            if response.status_code == 200 and seen == expected:
+                self.log_result("GET /api/projects?fields&limit (pages)", True, f"{len(seen)} trimmed projects across pages")
+            else:
+                self.log_result("GET /api/projects?fields&limit (pages)", False, f"HTTP {response.status_code}, paged {seen} vs {expected}")
+
+            response = requests.get(f"{API_BASE}/projects", params={'fields': 'title', 'format': 'ndjson'}, timeout=10)
+            lines = [json.loads(line) for line in response.text.splitlines() if line.strip()] if response.status_code == 200 else []
+            if [(line.get('_id'), line.get('title')) for line in lines] == expected and all(set(line) == {'_id', 'title'} for line in lines):
+                self.log_result("GET /api/projects?fields&format=ndjson", True, f"{len(lines)} trimmed lines")
+            else:
+                self.log_result("GET /api/projects?fields&format=ndjson", False, f"HTTP {response.status_code}: {response.text[:200]}")
+
+            response = requests.get(f"{API_BASE}/projects", params={'fields': 'bogus'}, timeout=10)
+            if response.status_code == 400:
+                self.log_result("GET /api/projects?fields=bogus", True, "Unknown field rejected")
+            else:
+                self.log_result("GET /api/projects?fields=bogus", False, f"Expected 400, got HTTP {response.status_code}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("Sparse fieldsets", False, f"Request failed: {str(e)}")
+    
     def test_get_project_categories(self):
         """Test GET /api/projects/categories endpoint"""
         try:
@@ -164,6 +299,39 @@ class PortfolioAPITester:
         except requests.exceptions.RequestException as e:
             self.log_result("GET /api/skills", False, f"Request failed: {str(e)}")
     
+    def test_skill_mutations(self):
+        """Test POST/PUT/DELETE /api/skills/technical/{name} and GET /api/skills/stats"""
+        try:
+            skill = {'name': 'Test Skill', 'level': 42}
+            response = requests.post(f"{API_BASE}/skills/technical", json=skill, timeout=10)
+            if response.status_code == 201:
+                self.log_result("POST /api/skills/technical", True, "Skill added")
+            else:
+                self.log_result("POST /api/skills/technical", False, f"HTTP {response.status_code}: {response.text}")
+                return
+            
+            response = requests.put(f"{API_BASE}/skills/technical/Test%20Skill", json={**skill, 'level': 43}, timeout=10)
+            if response.status_code == 200 and response.json().get('level') == 43:
+                self.log_result("PUT /api/skills/technical/{name}", True, "Skill level updated")
+            else:
+                self.log_result("PUT /api/skills/technical/{name}", False, f"HTTP {response.status_code}: {response.text}")
+            
+            response = requests.get(f"{API_BASE}/skills/stats", params={'top': 3}, timeout=10)
+            stats = response.json() if response.status_code == 200 else {}
+            if isinstance(stats.get('count'), int) and len(stats.get('top', [])) <= 3:
+                self.log_result("GET /api/skills/stats", True, f"{stats['count']} skills, average {stats.get('averageLevel')}")
+            else:
+                self.log_result("GET /api/skills/stats", False, f"HTTP {response.status_code}: {response.text}")
+            
+            response = requests.delete(f"{API_BASE}/skills/technical/Test%20Skill", timeout=10)
+            if response.status_code == 204:
+                self.log_result("DELETE /api/skills/technical/{name}", True, "Skill removed")
+            else:
+                self.log_result("DELETE /api/skills/technical/{name}", False, f"HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Skill mutations", False, f"Request failed: {str(e)}")
+    
     def test_get_certifications(self):
         """Test GET /api/certifications endpoint"""
         try:
@@ -217,16 +385,151 @@ class PortfolioAPITester:
         except requests.exceptions.RequestException as e:
             self.log_result("GET /api/achievements", False, f"Request failed: {str(e)}")
     
+    def test_get_portfolio(self):
+        """Test GET /api/portfolio endpoint"""
+        try:
+            response = requests.get(f"{API_BASE}/portfolio", timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                sections = ['profile', 'experience', 'projects', 'skills', 'certifications', 'achievements']
+                missing_sections = [section for section in sections if section not in data]
+                if missing_sections:
+                    self.log_result("GET /api/portfolio", False, f"Missing sections: {missing_sections}")
+                else:
+                    self.log_result("GET /api/portfolio", True, f"Retrieved {len(sections)} sections")
+            else:
+                self.log_result("GET /api/portfolio", False, f"HTTP {response.status_code}: {response.text}")
+            
+            # Section filter should only return the requested keys
+            response = requests.get(f"{API_BASE}/portfolio", params={'sections': 'profile,projects'}, timeout=10)
+            if response.status_code == 200 and set(response.json().keys()) == {'profile', 'projects'}:
+                self.log_result("GET /api/portfolio?sections", True, "Section filter working")
+            else:
+                self.log_result("GET /api/portfolio?sections", False, f"HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("GET /api/portfolio", False, f"Request failed: {str(e)}")
+    
+    def test_get_health(self):
+        """Test GET /api/health endpoint"""
+        try:
+            response = requests.get(f"{API_BASE}/health", timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('status') == 'ok' and data.get('database', {}).get('status') == 'ok':
+                    self.log_result("GET /api/health", True, f"Database ping {data['database'].get('latencyMs')} ms")
+                else:
+                    self.log_result("GET /api/health", False, f"Unexpected health payload: {data}")
+            else:
+                self.log_result("GET /api/health", False, f"HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("GET /api/health", False, f"Request failed: {str(e)}")
+    
+    def test_conditional_get(self):
+        """Test ETag/Last-Modified revalidation on GET /api/achievements and that a write changes the ETag"""
+        try:
+            response = requests.get(f"{API_BASE}/achievements", timeout=10)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if response.status_code != 200 or not etag:
+                self.log_result("GET /api/achievements (ETag)", False, f"HTTP {response.status_code}, ETag {etag}")
+                return
+
+            response = requests.get(f"{API_BASE}/achievements", headers={'If-None-Match': etag}, timeout=10)
+            if response.status_code == 304 and not response.content:
+                self.log_result("GET /api/achievements (If-None-Match)", True, "304 Not Modified")
+            else:
+                self.log_result("GET /api/achievements (If-None-Match)", False, f"HTTP {response.status_code}")
+
+            if last_modified:
+                response = requests.get(f"{API_BASE}/achievements", headers={'If-Modified-Since': last_modified}, timeout=10)
+                if response.status_code == 304:
+                    self.log_result("GET /api/achievements (If-Modified-Since)", True, "304 Not Modified")
+                else:
+                    self.log_result("GET /api/achievements (If-Modified-Since)", False, f"HTTP {response.status_code}")
+
+            item_id = requests.post(f"{API_BASE}/achievements", json={'description': 'ETag test'}, timeout=10).json()['_id']
+            response = requests.get(f"{API_BASE}/achievements", headers={'If-None-Match': etag}, timeout=10)
+            requests.delete(f"{API_BASE}/achievements/{item_id}", timeout=10)
+            if response.status_code == 200 and response.headers.get('ETag') not in (None, etag):
+                self.log_result("GET /api/achievements (after write)", True, "ETag changed")
+            else:
+                self.log_result("GET /api/achievements (after write)", False, f"HTTP {response.status_code}, ETag {response.headers.get('ETag')}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("Conditional GET", False, f"Request failed: {str(e)}")
+
+    def test_last_modified_after_delete(self):
+        """Test that deleting an item moves Last-Modified on GET /api/achievements, so If-Modified-Since gets the new list"""
+        try:
+            item_id = requests.post(f"{API_BASE}/achievements", json={'description': 'Last-Modified test'}, timeout=10).json()['_id']
+            last_modified = requests.get(f"{API_BASE}/achievements", timeout=10).headers.get('Last-Modified')
+            # HTTP dates have one-second resolution
+            time.sleep(1.1)
+            requests.delete(f"{API_BASE}/achievements/{item_id}", timeout=10)
+            response = requests.get(f"{API_BASE}/achievements", headers={'If-Modified-Since': last_modified}, timeout=10)
+            ids = [item['_id'] for item in response.json()] if response.status_code == 200 else []
+            if response.status_code == 200 and item_id not in ids and response.headers.get('Last-Modified') != last_modified:
+                self.log_result("GET /api/achievements (If-Modified-Since after delete)", True, "Deleted item gone, Last-Modified moved")
+            else:
+                self.log_result("GET /api/achievements (If-Modified-Since after delete)", False, f"HTTP {response.status_code}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("Last-Modified after delete", False, f"Request failed: {str(e)}")
+
+    def test_conditional_writes(self):
+        """Test If-Match/412 and no-op detection on PUT /api/profile, and If-Match on reorder"""
+        try:
+            response = requests.get(f"{API_BASE}/profile", timeout=10)
+            if response.status_code != 200:
+                self.log_result("PUT /api/profile (conditional)", False, f"HTTP {response.status_code}: {response.text}")
+                return
+            original = {key: value for key, value in response.json().items() if key not in ('_id', 'createdAt', 'updatedAt')}
+            etag = response.headers.get('ETag')
+
+            response = requests.put(f"{API_BASE}/profile", json=original, timeout=10)
+            before = requests.get(f"{API_BASE}/profile", timeout=10).json().get('updatedAt')
+            response = requests.put(f"{API_BASE}/profile", json=original, headers={'If-Match': etag}, timeout=10)
+            if response.status_code == 200 and response.json().get('updatedAt') == before:
+                self.log_result("PUT /api/profile (no-op)", True, "Unchanged write skipped")
+            else:
+                self.log_result("PUT /api/profile (no-op)", False, f"HTTP {response.status_code}, updatedAt {response.json().get('updatedAt')} vs {before}")
+            etag = response.headers.get('ETag')
+
+            changed = dict(original, bio=original['bio'] + ' (edited)')
+            response = requests.put(f"{API_BASE}/profile", json=changed, headers={'If-Match': etag}, timeout=10)
+            new_etag = response.headers.get('ETag')
+            stale = requests.put(f"{API_BASE}/profile", json=original, headers={'If-Match': etag}, timeout=10)
+            if response.status_code == 200 and new_etag != etag and stale.status_code == 412:
+                self.log_result("PUT /api/profile (If-Match)", True, "Current ETag accepted, stale ETag rejected with 412")
+            else:
+                self.log_result("PUT /api/profile (If-Match)", False, f"HTTP {response.status_code} then {stale.status_code}")
+            requests.put(f"{API_BASE}/profile", json=original, headers={'If-Match': new_etag}, timeout=10)
+
+            response = requests.get(f"{API_BASE}/achievements", timeout=10)
+            ids = [item['_id'] for item in response.json()]
+            stale = requests.post(
+                f"{API_BASE}/achievements/reorder", json={'ids': ids[::-1]}, headers={'If-Match': '"stale"'}, timeout=10
+            )
+            current = requests.post(
+                f"{API_BASE}/achievements/reorder", json={'ids': ids}, headers={'If-Match': response.headers.get('ETag')}, timeout=10
+            )
+            if stale.status_code == 412 and current.status_code == 200:
+                self.log_result("POST /api/achievements/reorder (If-Match)", True, "Stale list rejected with 412")
+            else:
+                self.log_result("POST /api/achievements/reorder (If-Match)", False, f"HTTP {stale.status_code} then {current.status_code}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("Conditional writes", False, f"Request failed: {str(e)}")
+
     def test_post_contact(self):
         """Test POST /api/contact endpoint"""
         try:
             # Test data for contact form
-            contact_data = {
-                "name": "John Doe",
-                "email": "john.doe@example.com",
-                "subject": "Portfolio Inquiry",
-                "message": "Hello, I'm interested in your work and would like to discuss potential opportunities."
-            }
+            contact_data = dict(SAMPLE_CONTACT)
             
             response = requests.post(
                 f"{API_BASE}/contact", 
@@ -256,6 +559,175 @@ class PortfolioAPITester:
         except requests.exceptions.RequestException as e:
             self.log_result("POST /api/contact", False, f"Request failed: {str(e)}")
     
+    def test_contact_inbox(self):
+        """Test contact inbox operations: unread count, PATCH /api/contact/{id} and the bulk filter guard"""
+        try:
+            response = requests.get(f"{API_BASE}/contact/unread-count", timeout=10)
+            if response.status_code == 200 and isinstance(response.json().get('unread'), int):
+                self.log_result("GET /api/contact/unread-count", True, f"{response.json()['unread']} unread")
+            else:
+                self.log_result("GET /api/contact/unread-count", False, f"HTTP {response.status_code}: {response.text}")
+            
+            response = requests.patch(f"{API_BASE}/contact", json={'filter': {}, 'archived': True}, timeout=10)
+            if response.status_code == 400:
+                self.log_result("PATCH /api/contact (empty filter)", True, "Whole-inbox update without \"all\" rejected")
+            else:
+                self.log_result("PATCH /api/contact (empty filter)", False, f"Expected 400, got HTTP {response.status_code}")
+
+            messages = requests.get(f"{API_BASE}/contact", params={'limit': 1}, timeout=10).json()
+            if not messages:
+                self.log_result("PATCH /api/contact/{id}", True, "Inbox empty, nothing to mark read")
+                return
+            message_id = messages[0]['_id']
+            response = requests.patch(f"{API_BASE}/contact/{message_id}", json={'isRead': True}, timeout=10)
+            if response.status_code == 200 and response.json().get('isRead') is True:
+                self.log_result("PATCH /api/contact/{id}", True, "Message marked as read")
+            else:
+                self.log_result("PATCH /api/contact/{id}", False, f"HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Contact inbox", False, f"Request failed: {str(e)}")
+    
+    def test_item_update_delete_reorder(self):
+        """Test GET/PUT/DELETE /api/achievements/{id} and POST /api/achievements/reorder"""
+        try:
+            response = requests.post(f"{API_BASE}/achievements", json={'description': 'Test achievement'}, timeout=10)
+            if response.status_code != 200:
+                self.log_result("POST /api/achievements", False, f"HTTP {response.status_code}: {response.text}")
+                return
+            item_id = response.json()['_id']
+            
+            response = requests.get(f"{API_BASE}/achievements/{item_id}", timeout=10)
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            not_modified = [
+                requests.get(f"{API_BASE}/achievements/{item_id}", headers=headers, timeout=10).status_code
+                for headers in ({'If-None-Match': etag or ''}, {'If-Modified-Since': last_modified or ''})
+            ]
+            if response.status_code == 200 and etag and last_modified and not_modified == [304, 304]:
+                self.log_result("GET /api/achievements/{id} (conditional)", True, "304 for If-None-Match and If-Modified-Since")
+            else:
+                self.log_result("GET /api/achievements/{id} (conditional)", False, f"HTTP {response.status_code}, revalidation {not_modified}")
+            
+            response = requests.put(f"{API_BASE}/achievements/{item_id}", json={'description': 'Updated achievement'}, timeout=10)
+            if response.status_code == 200 and response.json().get('description') == 'Updated achievement':
+                self.log_result("PUT /api/achievements/{id}", True, "Achievement updated")
+            else:
+                self.log_result("PUT /api/achievements/{id}", False, f"HTTP {response.status_code}: {response.text}")
+            
+            ids = [item['_id'] for item in requests.get(f"{API_BASE}/achievements", timeout=10).json()]
+            ids.remove(item_id)
+            response = requests.post(f"{API_BASE}/achievements/reorder", json={'ids': [item_id] + ids}, timeout=10)
+            first = requests.get(f"{API_BASE}/achievements", timeout=10).json()[0]['_id']
+            if response.status_code == 200 and first == item_id:
+                self.log_result("POST /api/achievements/reorder", True, f"{response.json()['modified']} positions changed")
+            else:
+                self.log_result("POST /api/achievements/reorder", False, f"HTTP {response.status_code}: {response.text}")
+            
+            # Put the original order back before removing the test item
+            requests.post(f"{API_BASE}/achievements/reorder", json={'ids': ids + [item_id]}, timeout=10)
+            response = requests.delete(f"{API_BASE}/achievements/{item_id}", timeout=10)
+            missing = requests.get(f"{API_BASE}/achievements/{item_id}", timeout=10).status_code == 404
+            if response.status_code == 204 and missing:
+                self.log_result("DELETE /api/achievements/{id}", True, "Achievement deleted")
+            else:
+                self.log_result("DELETE /api/achievements/{id}", False, f"HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Achievement item endpoints", False, f"Request failed: {str(e)}")
+    
+    def test_bulk_create(self):
+        """Test POST /api/achievements/bulk with a mix of valid and invalid items"""
+        try:
+            items = [{'description': 'Bulk achievement A'}, {'year': 2024}, {'description': 'Bulk achievement B'}]
+            response = requests.post(f"{API_BASE}/achievements/bulk", json=items, timeout=10)
+            if response.status_code != 200:
+                self.log_result("POST /api/achievements/bulk", False, f"HTTP {response.status_code}: {response.text}")
+                return
+            data = response.json()
+            statuses = [result['status'] for result in data['results']]
+            for result in data['results']:
+                if result.get('id'):
+                    requests.delete(f"{API_BASE}/achievements/{result['id']}", timeout=10)
+            if statuses == ['inserted', 'invalid', 'inserted'] and data['inserted'] == 2 and data['failed'] == 1:
+                self.log_result("POST /api/achievements/bulk", True, "2 inserted, 1 rejected with per-item errors")
+            else:
+                self.log_result("POST /api/achievements/bulk", False, f"Unexpected result: {data}")
+
+            response = requests.post(f"{API_BASE}/profile/bulk", json=[{}], timeout=10)
+            if response.status_code == 404:
+                self.log_result("POST /api/profile/bulk", True, "Unsupported collection rejected")
+            else:
+                self.log_result("POST /api/profile/bulk", False, f"Expected 404, got HTTP {response.status_code}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("POST /api/achievements/bulk", False, f"Request failed: {str(e)}")
+
+    def test_media_upload(self):
+        """Test POST /api/media and that the stored variant can be fetched"""
+        try:
+            response = requests.post(
+                f"{API_BASE}/media", files={'file': ('test.png', SAMPLE_IMAGE, 'image/png')}, timeout=30
+            )
+            if response.status_code != 201:
+                self.log_result("POST /api/media", False, f"HTTP {response.status_code}: {response.text}")
+                return
+            media = response.json()
+            if media.get('width') == 2 and media.get('variants'):
+                self.log_result("POST /api/media", True, f"Stored {media['_id'][:12]} with {len(media['variants'])} variant(s)")
+            else:
+                self.log_result("POST /api/media", False, f"Unexpected media document: {media}")
+                return
+            
+            variant_url = media['variants'][0]['url']
+            if variant_url.startswith('/'):
+                variant_url = f"{BACKEND_URL}{variant_url}"
+            response = requests.get(variant_url, timeout=10)
+            if response.status_code == 200 and response.headers.get('Content-Type') == 'image/webp':
+                self.log_result("GET media variant", True, f"{len(response.content)} bytes of WebP")
+            else:
+                self.log_result("GET media variant", False, f"HTTP {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("POST /api/media", False, f"Request failed: {str(e)}")
+    
+    def test_project_image(self):
+        """Test PUT /api/projects/{id}/image and that a new imageUrl drops the uploaded image"""
+        try:
+            project = {
+                'title': 'Image test project', 'description': 'Project image test',
+                'technologies': ['Python'], 'status': 'Completed', 'category': 'Data',
+            }
+            response = requests.post(f"{API_BASE}/projects", json=project, timeout=10)
+            if response.status_code != 200:
+                self.log_result("PUT /api/projects/{id}/image", False, f"Could not create test project: HTTP {response.status_code}")
+                return
+            project_id = response.json()['_id']
+
+            response = requests.put(
+                f"{API_BASE}/projects/{project_id}/image", files={'file': ('test.png', SAMPLE_IMAGE, 'image/png')}, timeout=30
+            )
+            image = response.json().get('image') if response.status_code == 200 else None
+            if image and response.json().get('imageUrl') == image['src']:
+                self.log_result("PUT /api/projects/{id}/image", True, f"imageUrl points at {image['src']}")
+            else:
+                self.log_result("PUT /api/projects/{id}/image", False, f"HTTP {response.status_code}: {response.text}")
+
+            if image:
+                response = requests.put(f"{API_BASE}/projects/{project_id}", json={**project, 'imageUrl': image['src']}, timeout=10)
+                kept = response.status_code == 200 and response.json().get('image') == image
+                response = requests.put(
+                    f"{API_BASE}/projects/{project_id}", json={**project, 'imageUrl': 'https://example.com/new.png'}, timeout=10
+                )
+                if kept and response.status_code == 200 and response.json().get('image') is None:
+                    self.log_result("PUT /api/projects/{id} imageUrl", True, "Same URL keeps the upload, a new URL clears it")
+                else:
+                    self.log_result("PUT /api/projects/{id} imageUrl", False, f"HTTP {response.status_code}: {response.text}")
+
+            requests.delete(f"{API_BASE}/projects/{project_id}", timeout=10)
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("PUT /api/projects/{id}/image", False, f"Request failed: {str(e)}")
+    
     def test_contact_form_validation(self):
         """Test POST /api/contact with invalid data"""
         try:
@@ -283,6 +755,23 @@ class PortfolioAPITester:
         except requests.exceptions.RequestException as e:
             self.log_result("POST /api/contact (validation)", False, f"Request failed: {str(e)}")
     
+    def test_contact_rate_limit(self):
+        """Test that POST /api/contact answers 429 with Retry-After once a sender's burst is used up"""
+        try:
+            contact = {**SAMPLE_CONTACT, 'email': f"rate-limit-{int(time.time())}@example.com"}
+            for attempt in range(1, 51):
+                response = requests.post(f"{API_BASE}/contact", json=contact, timeout=10)
+                if response.status_code != 200:
+                    break
+            retry_after = response.headers.get('Retry-After', '')
+            if response.status_code == 429 and retry_after.isdigit() and int(retry_after) > 0:
+                self.log_result("POST /api/contact (rate limit)", True, f"429 after {attempt} messages, Retry-After {retry_after}s")
+            else:
+                self.log_result("POST /api/contact (rate limit)", False, f"HTTP {response.status_code}, Retry-After {retry_after!r}")
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("POST /api/contact (rate limit)", False, f"Request failed: {str(e)}")
+    
     def run_all_tests(self):
         """Run all backend API tests"""
         print(f"🚀 Starting Backend API Tests for Space-themed Portfolio")
@@ -293,14 +782,30 @@ class PortfolioAPITester:
         self.test_get_profile()
         self.test_get_experience()
         self.test_get_projects()
+        self.test_projects_pagination()
+        self.test_sparse_fields()
         self.test_get_project_categories()
         self.test_get_skills()
         self.test_get_certifications()
         self.test_get_achievements()
+        self.test_get_portfolio()
+        self.test_search()
+        self.test_get_health()
+        self.test_conditional_get()
+        self.test_last_modified_after_delete()
         
         # Test POST endpoints
         self.test_post_contact()
+        self.test_contact_inbox()
         self.test_contact_form_validation()
+        self.test_item_update_delete_reorder()
+        self.test_conditional_writes()
+        self.test_bulk_create()
+        self.test_skill_mutations()
+        self.test_media_upload()
+        self.test_project_image()
+        # Last: it uses up this client's contact form allowance
+        self.test_contact_rate_limit()
         
         # Print summary
         print("=" * 60)
@@ -317,6 +822,10 @@ class PortfolioAPITester:
         return self.results['failed'] == 0
 
 if __name__ == "__main__":
+    if not BACKEND_URL:
+        print("❌ REACT_APP_BACKEND_URL not found in environment")
+        sys.exit(1)
+    
     tester = PortfolioAPITester()
     success = tester.run_all_tests()
     
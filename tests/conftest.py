@@ -0,0 +1,18 @@
+"""Shared setup for the in-process tests: the backend modules on sys.path and
+a mongomock-motor database, so no MongoDB server is needed."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# seed_db and server read these at import; nothing connects until used
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "portfolio_test")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def mock_db():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    return mongomock_motor.AsyncMongoMockClient()[os.environ["DB_NAME"]]
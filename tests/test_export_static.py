@@ -0,0 +1,65 @@
+"""export_static against mongomock: bundles match the live API and rebuild only what a write touched."""
+import asyncio
+import contextlib
+import io
+import json
+
+import pytest
+
+import export_static
+import seed_db
+import server
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def app_db(mock_db, monkeypatch):
+    """The app and the exporter reading a freshly seeded ``mock_db``."""
+    monkeypatch.setattr(seed_db, "db", mock_db)
+    monkeypatch.setattr(server, "db", mock_db)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(seed_db.seed_database())
+    server.response_cache.clear()
+    yield mock_db
+    server.response_cache.clear()
+
+
+async def api_get(path):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Uncompressed, to compare with the plain .json bundle
+        return await client.get(f"/api/{path}", headers={"Accept-Encoding": "identity"})
+
+
+async def api_post(path, body):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(f"/api/{path}", json=body)
+
+
+def test_portfolio_bundle_matches_api(app_db, tmp_path):
+    rebuilt, _ = asyncio.run(export_static.export_site(tmp_path))
+    assert set(rebuilt) == set(export_static.BUNDLES)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+
+    response = asyncio.run(api_get("portfolio"))
+    assert response.status_code == 200
+    assert (tmp_path / "api" / "portfolio.json").read_bytes() == response.content
+    assert (tmp_path / manifest["bundles"]["portfolio"]["file"]).read_bytes() == response.content
+    assert manifest["bundles"]["portfolio"]["etag"] == response.headers["ETag"]
+
+
+def test_write_rebuilds_only_dependent_bundles(app_db, tmp_path):
+    asyncio.run(export_static.export_site(tmp_path))
+    rebuilt, _ = asyncio.run(export_static.export_site(tmp_path))
+    assert rebuilt == []
+
+    response = asyncio.run(api_post("achievements", {"description": "Export test achievement"}))
+    assert response.status_code == 200
+    rebuilt, _ = asyncio.run(export_static.export_site(tmp_path))
+    assert sorted(rebuilt) == ["achievements", "portfolio"]
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    achievements = json.loads((tmp_path / manifest["bundles"]["achievements"]["file"]).read_bytes())
+    assert "Export test achievement" in [item["description"] for item in achievements]
@@ -0,0 +1,91 @@
+"""seed_db against mongomock: re-runs, --dry-run and --prune only change what they should."""
+import asyncio
+import copy
+
+import pytest
+
+import seed_db
+
+CONTENT_COLLECTIONS = list(seed_db.SEED_KEYS)
+
+
+@pytest.fixture
+def seed(mock_db, monkeypatch):
+    """Run seed_database against ``mock_db`` with a private copy of MOCK_DATA."""
+    monkeypatch.setattr(seed_db, "db", mock_db)
+    monkeypatch.setattr(seed_db, "MOCK_DATA", copy.deepcopy(seed_db.MOCK_DATA))
+
+    def run(**options):
+        asyncio.run(seed_db.seed_database(**options))
+    return run
+
+
+def dump(db, collections=CONTENT_COLLECTIONS + ["contact_messages"]):
+    async def read():
+        return {name: await db[name].find().sort("_id", 1).to_list(None) for name in collections}
+    return asyncio.run(read())
+
+
+def test_first_run_inserts_every_entry(seed, mock_db):
+    seed()
+    data = dump(mock_db)
+    for name in CONTENT_COLLECTIONS:
+        entries = seed_db.MOCK_DATA[name]
+        assert len(data[name]) == (1 if isinstance(entries, dict) else len(entries))
+        assert all("seedHash" in doc for doc in data[name])
+
+
+def test_rerun_writes_nothing(seed, mock_db):
+    seed()
+    before = dump(mock_db)
+    seed()
+    # Every write stamps updatedAt, so any write would show up here
+    assert dump(mock_db) == before
+
+
+def test_changed_entry_is_updated_in_place(seed, mock_db):
+    seed()
+    before = {doc["title"]: doc for doc in dump(mock_db)["projects"]}
+    project = seed_db.MOCK_DATA["projects"][0]
+    project["status"] = "Archived"
+    seed()
+    after = {doc["title"]: doc for doc in dump(mock_db)["projects"]}
+    assert after[project["title"]]["_id"] == before[project["title"]]["_id"]
+    assert after[project["title"]]["status"] == "Archived"
+    assert {title: doc for title, doc in after.items() if title != project["title"]} == \
+        {title: doc for title, doc in before.items() if title != project["title"]}
+
+
+def test_dry_run_writes_nothing(seed, mock_db):
+    seed(dry_run=True)
+    assert all(not documents for documents in dump(mock_db).values())
+
+    seed()
+    before = dump(mock_db)
+    seed_db.MOCK_DATA["projects"][0]["status"] = "Archived"
+    seed_db.MOCK_DATA["projects"].pop()
+    seed(dry_run=True, prune=True)
+    assert dump(mock_db) == before
+
+
+def test_prune_deletes_only_seeded_documents(seed, mock_db):
+    seed()
+    asyncio.run(mock_db.projects.insert_one({"title": "Added through the API", "status": "Completed"}))
+    removed = seed_db.MOCK_DATA["projects"].pop()
+
+    seed()
+    assert removed["title"] in {doc["title"] for doc in dump(mock_db)["projects"]}
+
+    seed(prune=True)
+    titles = {doc["title"] for doc in dump(mock_db)["projects"]}
+    assert removed["title"] not in titles
+    assert "Added through the API" in titles
+    assert len(titles) == len(seed_db.MOCK_DATA["projects"]) + 1
+
+
+def test_contact_messages_are_never_touched(seed, mock_db):
+    message = {"name": "Visitor", "email": "visitor@example.com", "subject": "Hi", "message": "Hello", "isRead": False}
+    asyncio.run(mock_db.contact_messages.insert_one(message))
+    seed()
+    seed(prune=True)
+    assert dump(mock_db, ["contact_messages"])["contact_messages"] == [message]